@@ -0,0 +1,81 @@
+"""
+Check that the stubs generated with --no-format are identical to the stubs formatted
+by ruff, and compare the time of both modes.
+
+    python benchmarks/canonical.py SNAPSHOT CONFIG [--expected STUBS]
+
+With --expected, the generated stubs are also compared with existing stubs, e.g.,
+stubs/2.5.3/mobase-stubs for a snapshot of MO2 2.5.3.
+"""
+
+import argparse
+import difflib
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+def generate(snapshot: Path, config: Path, output: Path, *args: str) -> float:
+    start = time.perf_counter()
+    subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "mo2.stubs.generator",
+            "--snapshot",
+            snapshot.as_posix(),
+            "-c",
+            config.as_posix(),
+            "-o",
+            output.as_posix(),
+            *args,
+        ],
+        check=True,
+        stderr=subprocess.DEVNULL,
+    )
+    return time.perf_counter() - start
+
+
+def compare(expected: Path, actual: Path) -> int:
+    differences = 0
+    for path in sorted(expected.rglob("*.pyi")):
+        other = actual.joinpath(path.relative_to(expected))
+        lines = difflib.unified_diff(
+            path.read_text().splitlines(keepends=True),
+            other.read_text().splitlines(keepends=True) if other.exists() else [],
+            fromfile=path.as_posix(),
+            tofile=other.as_posix(),
+        )
+        for line in lines:
+            sys.stdout.write(line)
+            differences += 1
+    return differences
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser("check of the stubs generated with --no-format")
+    parser.add_argument("snapshot", type=Path)
+    parser.add_argument("config", type=Path)
+    parser.add_argument("--expected", type=Path, default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        formatted, canonical = Path(folder, "ruff"), Path(folder, "canonical")
+
+        t_formatted = generate(args.snapshot, args.config, formatted)
+        t_canonical = generate(args.snapshot, args.config, canonical, "--no-format")
+        print(f"with ruff: {t_formatted:.2f} s, with --no-format: {t_canonical:.2f} s")
+
+        differences = compare(formatted, canonical)
+        if args.expected is not None:
+            differences += compare(args.expected, canonical)
+
+    if differences:
+        sys.exit(1)
+    print("stubs are identical")
+
+
+if __name__ == "__main__":
+    main()
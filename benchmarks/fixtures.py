@@ -0,0 +1,345 @@
+"""
+Builder of synthetic pybind11-like mobase modules and of their configuration, used
+to benchmark the generator without MO2 (the real mobase only exists on Windows).
+
+The modules mimic the objects pybind11 creates: classes rooted in
+pybind11_builtins.pybind11_object, methods whose docstrings contain their signatures
+(numbered after "Overloaded function." for overloaded ones), properties, and enums
+with an __entries attribute.
+
+    python benchmarks/fixtures.py OUTPUT [--classes CLASSES] [--depth DEPTH]
+        [--methods METHODS] [--overloads OVERLOADS] [--doc-lines DOC_LINES] ...
+
+This writes OUTPUT/mobase.json.gz (see --snapshot in the README) and
+OUTPUT/config.yml, e.g., to time the generator end-to-end:
+
+    python -m mo2.stubs.generator --snapshot OUTPUT/mobase.json.gz \\
+        -c OUTPUT/config.yml -o OUTPUT/stubs
+"""
+
+import argparse
+import types
+from pathlib import Path
+from typing import Any, Callable, NamedTuple
+
+import yaml
+
+from mo2.stubs.generator.snapshot import capture_module, save_snapshot
+
+# the classes of the generator are looked up in mobase, so the fixtures use its name
+MODULE = "mobase"
+
+# types of the arguments, cycled through
+ARGUMENT_TYPES = [
+    "int",
+    "str",
+    "bool",
+    "float",
+    "List[str]",
+    "Dict[str, int]",
+    "Union[str, os.PathLike]",
+    "Callable[[str, int], bool]",
+]
+
+
+class Scale(NamedTuple):
+    """
+    Scale of a synthetic module.
+    """
+
+    # number of classes, in chains of depth classes (each class but the first of a
+    # chain derives from the previous one)
+    classes: int = 200
+    depth: int = 4
+
+    # number of methods and properties of each class, each class also overrides the
+    # first method of its base
+    methods: int = 6
+    properties: int = 2
+
+    # number of overloads of each method and function (1 for no overloads)
+    overloads: int = 2
+
+    # number of free functions, of enums and of entries per enum
+    functions: int = 20
+    enums: int = 10
+    entries: int = 6
+
+    # number of lines of each docstring, both in the docstrings of the overloads
+    # and in the configuration
+    doc_lines: int = 2
+
+
+class pybind11_object:
+    __slots__ = ()
+
+
+pybind11_object.__module__ = "pybind11_builtins"
+
+
+def class_name(index: int) -> str:
+    # zero-padded so that the alphabetical order of the classes is the order of their
+    # hierarchy, as for the real mobase
+    return f"C{index:05}"
+
+
+def enum_name(index: int) -> str:
+    return f"E{index:03}"
+
+
+def method_name(index: int, method: int) -> str:
+    return f"c{index}_m{method}"
+
+
+def base_index(scale: Scale, index: int) -> int | None:
+    return index - 1 if index % scale.depth else None
+
+
+def _text(name: str, lines: int) -> str:
+    return "\n".join(
+        f"Line {line} of the documentation of {name}." for line in range(lines)
+    )
+
+
+def _arguments(scale: Scale, seed: int, overload: int) -> list[str]:
+    # overloads of a method have different numbers of arguments, and once an
+    # argument has a default value, the following ones have one too
+    arguments: list[str] = []
+    default = False
+    for a in range(1 + overload % 3):
+        k = seed + overload + a
+        if k % 5 == 3 and scale.enums:
+            e = enum_name(k % scale.enums)
+            arguments.append(f"a{a}: {MODULE}.{e} = <{e}.V0: 0>")
+            default = True
+        elif k % 7 == 4 and k % scale.classes != seed % scale.classes:
+            arguments.append(f"a{a}: {MODULE}.{class_name(k % scale.classes)}")
+        else:
+            arguments.append(f"a{a}: {ARGUMENT_TYPES[k % len(ARGUMENT_TYPES)]}")
+
+        if default and "=" not in arguments[-1]:
+            arguments[-1] += " = None"
+    return arguments
+
+
+def _signatures(
+    scale: Scale, name: str, seed: int, self_type: str | None, overloads: int
+) -> list[str]:
+    signatures: list[str] = []
+    for overload in range(overloads):
+        arguments = _arguments(scale, seed, overload)
+        if self_type is not None:
+            arguments.insert(0, f"self: {self_type}")
+        return_type = ARGUMENT_TYPES[(seed + overload) % 4]
+        signatures.append(f"{name}({', '.join(arguments)}) -> {return_type}")
+    return signatures
+
+
+def _function(
+    scale: Scale, name: str, seed: int, self_type: str | None, overloads: int
+) -> Callable[..., Any]:
+    signatures = _signatures(scale, name, seed, self_type, overloads)
+
+    doc: str
+    if len(signatures) == 1:
+        # pybind11 only puts the signature if the function has no docstring
+        doc = signatures[0] + "\n"
+    else:
+        doc = f"{name}(*args, **kwargs)\nOverloaded function.\n\n"
+        for i, signature in enumerate(signatures):
+            doc += f"{i + 1}. {signature}\n\n{_text(name, scale.doc_lines)}\n\n"
+
+    def function(*args: Any, **kwargs: Any) -> Any: ...
+
+    function.__name__ = function.__qualname__ = name
+    function.__doc__ = doc
+    function.__module__ = MODULE
+    return function
+
+
+def _special(name: str, arguments: str, return_type: str) -> Callable[..., Any]:
+    def function(*args: Any, **kwargs: Any) -> Any: ...
+
+    function.__name__ = function.__qualname__ = name
+    function.__doc__ = f"{name}({arguments}) -> {return_type}\n"
+    function.__module__ = MODULE
+    return function
+
+
+def _enum(scale: Scale, index: int) -> type:
+    name = enum_name(index)
+    self_type = f"{MODULE}.{name}"
+    attrs: dict[str, Any] = {
+        "__slots__": (),
+        "__doc__": None,
+        "__module__": MODULE,
+        "__qualname__": name,
+        "__int__": _special("__int__", f"self: {self_type}", "int"),
+        "__str__": _special("__str__", f"self: {self_type}", "str"),
+        "__eq__": _special("__eq__", f"self: {self_type}, other: object", "bool"),
+        "__ne__": _special("__ne__", f"self: {self_type}, other: object", "bool"),
+    }
+    cls = type(name, (pybind11_object,), attrs)
+
+    entries = {f"V{i}": (i, None) for i in range(scale.entries)}
+    setattr(cls, "__entries", entries)
+    for entry in entries:
+        setattr(cls, entry, object.__new__(cls))
+
+    return cls
+
+
+def _class(scale: Scale, index: int, base: type) -> type:
+    name = class_name(index)
+    self_type = f"{MODULE}.{name}"
+
+    attrs: dict[str, Any] = {
+        "__slots__": (),
+        "__doc__": None,
+        "__module__": MODULE,
+        "__qualname__": name,
+        "__init__": _special("__init__", f"self: {self_type}", "None"),
+    }
+    for m in range(scale.methods):
+        n = method_name(index, m)
+        attrs[n] = _function(scale, n, index + m, self_type, scale.overloads)
+
+    b = base_index(scale, index)
+    if b is not None and scale.methods:
+        n = method_name(b, 0)
+        attrs[n] = _function(scale, n, index, self_type, 1)
+
+    for p in range(scale.properties):
+        attrs[f"p{p}"] = property(
+            lambda self: None, (lambda self, value: None) if p % 2 else None
+        )
+
+    return type(name, (base,), attrs)
+
+
+def build_modules(scale: Scale) -> tuple[types.ModuleType, types.ModuleType]:
+    """
+    Build synthetic mobase and mobase.widgets modules (the latter is empty).
+    """
+    module = types.ModuleType(MODULE)
+
+    for e in range(scale.enums):
+        setattr(module, enum_name(e), _enum(scale, e))
+
+    classes: list[type] = []
+    for c in range(scale.classes):
+        b = base_index(scale, c)
+        classes.append(_class(scale, c, pybind11_object if b is None else classes[b]))
+        setattr(module, class_name(c), classes[-1])
+
+    for f in range(scale.functions):
+        name = f"function{f}"
+        setattr(module, name, _function(scale, name, f, None, scale.overloads))
+
+    module.widgets = types.ModuleType(f"{MODULE}.widgets")  # type: ignore
+
+    return module, module.widgets  # type: ignore
+
+
+def _function_settings(
+    scale: Scale, name: str, overloads: list[list[str]]
+) -> dict[str, Any]:
+    settings: dict[str, Any] = {}
+    for i, arguments in enumerate(overloads):
+        names = [a.split(":")[0] for a in arguments]
+        settings[f"{name}.{i + 1}" if len(overloads) > 1 else name] = {
+            "__doc__": _text(name, scale.doc_lines),
+            "args": {a: f"Argument {a} of {name}." for a in names},
+            "returns": f"The result of {name}.",
+        }
+    return settings
+
+
+def _overloads(scale: Scale, seed: int, overloads: int) -> list[list[str]]:
+    return [_arguments(scale, seed, overload) for overload in range(overloads)]
+
+
+def build_config(scale: Scale) -> dict[str, Any]:
+    """
+    Build the configuration of the modules built by build_modules(), documenting
+    all the objects.
+    """
+    settings: dict[str, Any] = {}
+
+    for e in range(scale.enums):
+        name = enum_name(e)
+        settings[name] = {"__doc__": _text(name, scale.doc_lines)} | {
+            f"V{i}": f"Entry {i} of {name}." for i in range(scale.entries)
+        }
+
+    for c in range(scale.classes):
+        name = class_name(c)
+        cls: dict[str, Any] = {"__doc__": _text(name, scale.doc_lines)}
+        for m in range(scale.methods):
+            n = method_name(c, m)
+            cls |= _function_settings(
+                scale, n, _overloads(scale, c + m, scale.overloads)
+            )
+
+        # the generator adds the overloads of the base to the overriding method
+        b = base_index(scale, c)
+        if b is not None and scale.methods:
+            n = method_name(b, 0)
+            cls |= _function_settings(
+                scale,
+                n,
+                _overloads(scale, b, scale.overloads) + _overloads(scale, c, 1),
+            )
+
+        cls["properties[]"] = {
+            f"p{p}": {"type": ARGUMENT_TYPES[p % 4], "desc": f"Property {p}."}
+            for p in range(scale.properties)
+        }
+        settings[name] = cls
+
+    for f in range(scale.functions):
+        name = f"function{f}"
+        settings |= _function_settings(
+            scale, name, _overloads(scale, f, scale.overloads)
+        )
+
+    return {"version": 2, "__version__": "0.0.0", MODULE: settings}
+
+
+def add_scale_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Add the options of the fields of Scale to the given parser.
+    """
+    for field, default in Scale._field_defaults.items():
+        parser.add_argument(
+            "--" + field.replace("_", "-"),
+            type=int,
+            default=default,
+            help=f"(default {default})",
+        )
+
+
+def parse_scale(args: argparse.Namespace) -> Scale:
+    return Scale(**{field: getattr(args, field) for field in Scale._fields})
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser("builder of synthetic pybind11-like modules")
+    parser.add_argument("output", type=Path)
+    add_scale_arguments(parser)
+    args = parser.parse_args()
+
+    scale = parse_scale(args)
+    output: Path = args.output
+    output.mkdir(parents=True, exist_ok=True)
+
+    save_snapshot(
+        output.joinpath("mobase.json.gz"),
+        [capture_module(module) for module in build_modules(scale)],
+    )
+    with open(output.joinpath("config.yml"), "w") as fp:
+        yaml.safe_dump(build_config(scale), fp, sort_keys=False, width=88)
+
+
+if __name__ == "__main__":
+    main()
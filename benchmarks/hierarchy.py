@@ -0,0 +1,79 @@
+"""
+Benchmark of mo2.stubs.generator.utils.clean_class() on synthetic deep hierarchies,
+i.e., chains of classes where each class adds new methods and overrides one method of
+its base.
+
+    python benchmarks/hierarchy.py [-m METHODS] [-r REPEAT] [DEPTH ...]
+"""
+
+import argparse
+import logging
+import time
+
+from mo2.stubs.generator.mtypes import Argument, Class, Method, PyType, Return
+from mo2.stubs.generator.register import ClassGraph
+from mo2.stubs.generator.utils import clean_class
+
+
+def make_method(cls: str, name: str) -> Method:
+    return Method(
+        name,
+        Return(PyType(int)),
+        [Argument("self", PyType(f"synthetic.{cls}")), Argument("x", PyType(int))],
+        static=False,
+    )
+
+
+def make_chain(depth: int, methods: int) -> list[Class]:
+    root = Class(
+        "synthetic",
+        "C0",
+        [],
+        [make_method("C0", f"m0_{i}") for i in range(methods)],
+    )
+    classes = [root]
+    for k in range(1, depth + 1):
+        name = f"C{k}"
+        classes.append(
+            Class(
+                "synthetic",
+                name,
+                [classes[-1]],
+                [make_method(name, f"m{k}_{i}") for i in range(methods)]
+                + [make_method(name, f"m{k - 1}_0")],
+            )
+        )
+    return classes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser("benchmark of clean_class on deep hierarchies")
+    parser.add_argument("depths", type=int, nargs="*", default=[25, 50, 100, 200, 400])
+    parser.add_argument("-m", "--methods", type=int, default=20)
+    parser.add_argument("-r", "--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    for depth in args.depths:
+        best = float("inf")
+        classes = make_chain(depth, args.methods)
+        for run in range(args.repeat):
+            # clean_class() modifies the classes, so each run needs new ones
+            if run:
+                classes = make_chain(depth, args.methods)
+            graph = ClassGraph()
+
+            start = time.perf_counter()
+            for cls in classes:
+                clean_class(cls, graph)
+            best = min(best, time.perf_counter() - start)
+
+        print(
+            f"depth {depth:4}: {best * 1e3:8.2f} ms,"
+            f" {best * 1e6 / len(classes):7.1f} us per class"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark of the startup of the generator with python -X importtime, checking that
+the heavy dependencies (PyYAML, PyQt6, typing_extensions, multiprocessing) are not
+imported by the modules of the generator but only by the stages that need them.
+
+    python benchmarks/imports.py [-r REPEAT] [-n MODULES]
+
+The import of each entry point is timed in a new interpreter, and the slowest
+modules (by cumulative time) of the fastest run are shown. The exit status is 1 if a
+heavy dependency is imported.
+"""
+
+import argparse
+import subprocess
+import sys
+from typing import NamedTuple
+
+# modules imported to start the entry points
+ENTRY_POINTS = [
+    "mo2.stubs.generator",
+    "mo2.stubs.generator.__main__",
+    "mo2.stubs.generator.diff",
+]
+
+# top-level packages that must only be imported when a stage needs them
+HEAVY_PACKAGES = [
+    "yaml",
+    "PyQt6",
+    "typing_extensions",
+    "concurrent",
+    "multiprocessing",
+]
+
+
+class ImportTime(NamedTuple):
+    module: str
+
+    # times in microseconds, of the module itself and including its imports
+    self_time: int
+    cumulative: int
+
+
+def import_times(module: str) -> list[ImportTime]:
+    """
+    Import the given module in a new interpreter and return the time of each of the
+    imported modules, in import order.
+    """
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    times: list[ImportTime] = []
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_time, cumulative, name = line.removeprefix("import time:").split("|")
+        times.append(ImportTime(name.strip(), int(self_time), int(cumulative)))
+    return times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser("benchmark of the imports of the generator")
+    parser.add_argument("-r", "--repeat", type=int, default=5)
+    parser.add_argument(
+        "-n",
+        "--modules",
+        type=int,
+        default=10,
+        help="number of modules to show for each entry point",
+    )
+    args = parser.parse_args()
+
+    heavy_imports = False
+    for entry_point in ENTRY_POINTS:
+        # the last module is the entry point itself, and includes everything else
+        best = min(
+            (import_times(entry_point) for _ in range(args.repeat)),
+            key=lambda times: times[-1].cumulative,
+        )
+        print(f"{entry_point}: {best[-1].cumulative / 1e3:.1f} ms")
+
+        for t in sorted(best, key=lambda t: t.cumulative, reverse=True)[
+            1 : args.modules + 1
+        ]:
+            print(f"  {t.cumulative / 1e3:>7.1f} ms  {t.module}")
+
+        heavy = sorted(
+            {
+                t.module
+                for t in best
+                if t.module.split(".")[0] in HEAVY_PACKAGES and "." not in t.module
+            }
+        )
+        if heavy:
+            heavy_imports = True
+            print("  heavy dependencies imported: {}".format(", ".join(heavy)))
+
+    sys.exit(1 if heavy_imports else 0)
+
+
+if __name__ == "__main__":
+    main()
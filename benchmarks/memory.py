@@ -0,0 +1,97 @@
+"""
+Benchmark of the memory used by the model of the generator (see mtypes.py) on a
+synthetic module (see benchmarks/fixtures.py), measured with tracemalloc.
+
+    python benchmarks/memory.py [--classes CLASSES] [--overloads OVERLOADS] ...
+
+The peak is measured while building the model with the functions of the generator
+(MobaseRegister.make_objects() and build.process_object(), i.e., make_object,
+clean_class and patch_class), and the retained memory is the memory still allocated once the model
+is built and the introspection data released from the register.
+"""
+
+import argparse
+import gc
+import logging
+import tracemalloc
+
+from fixtures import (
+    Scale,
+    add_scale_arguments,
+    build_config,
+    build_modules,
+    parse_scale,
+)
+
+from mo2.stubs.generator.__main__ import extract_objects
+from mo2.stubs.generator.build import process_object
+from mo2.stubs.generator.parser import is_enum
+from mo2.stubs.generator.register import MobaseRegister
+from mo2.stubs.generator.snapshot import ClassInfo, capture_module
+from mo2.stubs.generator.utils import Settings
+
+
+def build_model(scale: Scale) -> tuple[MobaseRegister, int, int]:
+    """
+    Build the model of a synthetic module of the given scale.
+
+    Returns:
+        A tuple (register, peak, retained) containing the register of the model, and
+        the peak and retained memory (in bytes) of the construction of the model.
+    """
+    modules = build_modules(scale)
+    config = build_config(scale)
+
+    module_objects = {
+        module.__name__: sorted(
+            extract_objects(capture_module(module)),
+            key=lambda e: (isinstance(e[1], ClassInfo), not is_enum(e[1]), e[0]),
+        )
+        for module in modules
+    }
+
+    register = MobaseRegister()
+    module_settings = {
+        name: Settings(register, config, module=name) for name in module_objects
+    }
+
+    gc.collect()
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    start = tracemalloc.get_traced_memory()[0]
+
+    # built as by the generator, see __main__._check_settings()
+    for name, objects in module_objects.items():
+        for n, o in objects:
+            register.add_object(n, o)
+        register.make_objects(n for n, _o in objects)
+        for n, o in objects:
+            process_object(register, module_settings[name], n, o)
+
+    register.release_raw_objects()
+    del module_objects
+    gc.collect()
+
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return register, peak - start, current - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser("benchmark of the memory of the model")
+    add_scale_arguments(parser)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    scale = parse_scale(args)
+    register, peak, retained = build_model(scale)
+
+    print(f"{len(register.objects)} objects")
+    print(f"peak:     {peak / 2**20:>8.2f} MiB")
+    print(f"retained: {retained / 2**20:>8.2f} MiB")
+
+
+if __name__ == "__main__":
+    main()
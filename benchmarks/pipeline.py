@@ -0,0 +1,205 @@
+"""
+Benchmark of each stage of the generator on synthetic modules of increasing size
+(see benchmarks/fixtures.py), to catch scaling regressions without MO2.
+
+    python benchmarks/pipeline.py [--sizes CLASSES ...] [-r REPEAT] [--ruff]
+        [--depth DEPTH] [--methods METHODS] [--overloads OVERLOADS] ...
+
+The stages are the ones of the generator, run one after the other on all the objects
+instead of object by object: extract (introspection of the modules), settings,
+make_object, clean_class, patch_class (and patch_functions), writer (rendering of
+each object) and format (joining of the rendered objects, and ruff with --ruff).
+"""
+
+import argparse
+import logging
+import subprocess
+import tempfile
+import time
+import types
+from collections import defaultdict
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+
+from fixtures import (
+    Scale,
+    add_scale_arguments,
+    build_config,
+    build_modules,
+    parse_scale,
+)
+
+from mo2.stubs.generator.__main__ import extract_objects, format_stubs
+from mo2.stubs.generator.build import join_fragments, render_fragment, stub_key
+from mo2.stubs.generator.cache import Fragment
+from mo2.stubs.generator.mtypes import Class, Function
+from mo2.stubs.generator.parser import is_enum
+from mo2.stubs.generator.register import MobaseRegister
+from mo2.stubs.generator.snapshot import ClassInfo, capture_module
+from mo2.stubs.generator.utils import Settings, clean_class
+from mo2.stubs.generator.writer import Writer, is_list_of
+
+STAGES = [
+    "extract",
+    "settings",
+    "make_object",
+    "clean_class",
+    "patch_class",
+    "writer",
+    "format",
+]
+
+
+def check_formatted(paths: Sequence[Path]) -> None:
+    """
+    Check that ruff would not change the given stubs, i.e., that the synthetic
+    modules give valid stubs and that the format stage measures ruff on them.
+
+    Raises:
+        RuntimeError: If ruff fails or would change the stubs.
+    """
+    files = [path.as_posix() for path in paths]
+    for command in (
+        ["ruff", "format", "--check", *files],
+        ["ruff", "check", "--select", "I", *files],
+    ):
+        process = subprocess.run(command, capture_output=True, text=True)
+        if process.returncode != 0:
+            raise RuntimeError(
+                "{} failed on the synthetic stubs:\n{}".format(
+                    " ".join(command[:2]), process.stdout + process.stderr
+                )
+            )
+
+
+def run_pipeline(
+    modules: Sequence[types.ModuleType],
+    config: dict[str, Any],
+    output: Path | None,
+) -> dict[str, float]:
+    """
+    Run the stages of the generator on the given modules, and return the wall time
+    of each stage.
+
+    Args:
+        modules: The modules to generate stubs for.
+        config: The configuration of the modules.
+        output: Folder where the stubs are written, checked with check_formatted()
+            (not timed) and formatted with ruff, or None to only join the rendered
+            objects.
+    """
+    times: dict[str, float] = {}
+
+    start = time.perf_counter()
+
+    def lap(stage: str) -> None:
+        nonlocal start
+        now = time.perf_counter()
+        times[stage] = now - start
+        start = now
+
+    module_objects = {
+        module.__name__: sorted(
+            extract_objects(capture_module(module)),
+            key=lambda e: (isinstance(e[1], ClassInfo), not is_enum(e[1]), e[0]),
+        )
+        for module in modules
+    }
+    lap("extract")
+
+    register = MobaseRegister()
+    module_settings = {
+        name: Settings(register, config, module=name) for name in module_objects
+    }
+    lap("settings")
+
+    for objects in module_objects.values():
+        for n, o in objects:
+            register.add_object(n, o)
+        register.make_objects(n for n, _o in objects)
+    lap("make_object")
+
+    for objects in module_objects.values():
+        for n, _o in objects:
+            c = register.get_object(n)
+            if isinstance(c, Class):
+                clean_class(c, register.class_graph)
+    lap("clean_class")
+
+    for name, objects in module_objects.items():
+        for n, _o in objects:
+            c = register.get_object(n)
+            if isinstance(c, Class):
+                module_settings[name].patch_class(c)
+            elif is_list_of(c, Function):
+                module_settings[name].patch_functions(c)
+    lap("patch_class")
+
+    fragments: dict[str, list[Fragment]] = {}
+    for name, objects in module_objects.items():
+        writer = Writer(package=name, settings=module_settings[name])
+        objs = [register.get_object(n) for n, _o in objects]
+        fragments[name] = [
+            render_fragment(writer, register.class_graph, o)
+            for o in sorted(objs, key=lambda o: stub_key(register.class_graph, o))
+        ]
+    lap("writer")
+
+    stubs = {name: join_fragments(fragments[name]) for name in fragments}
+    if output is not None:
+        paths: list[Path] = []
+        for name, content in stubs.items():
+            paths.append(output.joinpath(name.replace(".", "_") + ".pyi"))
+            paths[-1].write_text(content)
+
+        checked = time.perf_counter()
+        check_formatted(paths)
+        start += time.perf_counter() - checked
+
+        format_stubs(paths)
+    lap("format")
+
+    return times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser("benchmark of the stages of the generator")
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[100, 200, 400, 800],
+        help="number of classes of the synthetic modules",
+    )
+    parser.add_argument("-r", "--repeat", type=int, default=3)
+    parser.add_argument(
+        "--ruff", action="store_true", help="include ruff in the format stage"
+    )
+    add_scale_arguments(parser)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    print(f"{'classes':>8}" + "".join(f"{stage:>13}" for stage in STAGES))
+    for size in args.sizes:
+        scale: Scale = parse_scale(args)._replace(classes=size)
+        modules = build_modules(scale)
+        config = build_config(scale)
+
+        best: dict[str, float] = defaultdict(lambda: float("inf"))
+        for _ in range(args.repeat):
+            with tempfile.TemporaryDirectory() as folder:
+                times = run_pipeline(
+                    modules, config, Path(folder) if args.ruff else None
+                )
+            for stage, t in times.items():
+                best[stage] = min(best[stage], t)
+
+        print(
+            f"{size:>8}" + "".join(f"{best[stage] * 1e3:>10.2f} ms" for stage in STAGES)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""
+Benchmark of the parsing of pybind11 docstrings, comparing the lexer/parser from
+mo2.stubs.generator.signatures with the regex-based implementation it replaced.
+
+    python benchmarks/signatures.py [-n FUNCTIONS] [-r REPEAT] [--names NAMES]
+"""
+
+import argparse
+import random
+import re
+import timeit
+
+from mo2.stubs.generator.signatures import overload_signatures, parse_signature
+
+TYPES = [
+    "int",
+    "str",
+    "bool",
+    "mobase.IFileTree",
+    "MOBase::IOrganizer",
+    "os.PathLike",
+    "Union[str, os.PathLike, QFileInfo]",
+    "Callable[[mobase.IFileTree, str], mobase.IFileTree.WalkReturn]",
+    "Dict[str, List[Tuple[int, MOBase::FileTreeEntry]]]",
+    "Sequence[Union[str, Dict[str, Sequence[int]]]]",
+    "QFlags[PyQt6.QtCore.Qt.AlignmentFlag]",
+]
+
+DEFAULTS = {
+    "int": ["0", "-1"],
+    "str": ["''", "'\\\\'", "'a: b'"],
+    "bool": ["True", "False"],
+    "mobase.IFileTree": ["None"],
+    "MOBase::IOrganizer": ["None"],
+    "os.PathLike": ["None"],
+}
+
+
+def make_signature(rng: random.Random, name: str) -> str:
+    args = ["self: mobase.IFileTree"]
+    for i in range(rng.randint(0, 6)):
+        t = rng.choice(TYPES)
+        arg = f"arg{i}: {t}"
+        if t in DEFAULTS and rng.random() < 0.4:
+            arg += " = " + rng.choice(DEFAULTS[t])
+        args.append(arg)
+    return f"{name}({', '.join(args)}) -> {rng.choice(TYPES)}"
+
+
+def make_docstring(rng: random.Random, name: str) -> str:
+    n = rng.choice([1, 1, 1, 2, 3, 4])
+    if n == 1:
+        return make_signature(rng, name) + "\n"
+    lines = [f"{name}(*args, **kwargs)", "Overloaded function.", ""]
+    for i in range(n):
+        lines += [f"{i + 1}. {make_signature(rng, name)}", ""]
+    return "\n".join(lines)
+
+
+# previous implementation, kept for comparison
+
+
+def legacy_magic_split(
+    value: str, sep: str = ",", open: str = "(<[", close: str = ")>]"
+) -> list[str]:
+    i, j = 0, 0
+    s: list[int] = []
+    r: list[str] = []
+    while i < len(value):
+        j = i + 1
+        while j < len(value):
+            c = value[j]
+            if c == sep and not s:
+                break
+            if c in open:
+                s.append(open.index(c))
+            elif c in close:
+                if not s and sep in open and j + 1 == len(value):
+                    pass
+                else:
+                    t = s.pop()
+                    if t != close.index(c):
+                        raise ValueError(
+                            "Found closing element {} for opening element {}.".format(
+                                c, open[t]
+                            )
+                        )
+            j += 1
+        r.append(value[i:j])
+        i = j + 1
+    assert not s
+    return r
+
+
+def legacy_parse_python_signature(
+    s: str, name: str
+) -> tuple[str, list[tuple[str, str, str | None]]]:
+    m = re.search(rf"{name}\((.*)\)\s*->\s*([^:]+)\s*", s)
+    if not m:
+        raise ValueError(f"invalid signature: {s}")
+
+    args = legacy_magic_split(m.group(1).strip(), ",", open="[", close="]")
+
+    arguments: list[tuple[str, str, str | None]] = []
+    for pa in args:
+        m2 = re.search(
+            r"(?P<name>[^:]+)\s*:\s*(?P<type>[^=]+)\s*(=\s*(?P<value>[^,]+))?",
+            pa.strip(),
+        )
+        if not m2:
+            raise ValueError(f"invalid argument: {pa}, {s}")
+        arguments.append((m2["name"], m2["type"], m2["value"]))
+
+    return m.group(2), arguments
+
+
+def legacy_parse(
+    name: str, doc: str
+) -> list[tuple[str, list[tuple[str, str, str | None]]]]:
+    lines = doc.strip().split("\n")
+
+    signatures: list[str]
+    if len(lines) == 1:
+        signatures = lines
+    else:
+        signatures = []
+        for line in lines:
+            m = re.match(rf"^[0-9]+[.]\s+({name}.*)$", line)
+            if m:
+                signatures.append(m.group(1).strip())
+
+    return [
+        legacy_parse_python_signature(
+            signature.replace("MOBase::", "mobase.").replace("::", "."), name
+        )
+        for signature in signatures
+    ]
+
+
+def parse(name: str, doc: str) -> list[tuple[str, list[tuple[str, str, str | None]]]]:
+    return [
+        (
+            signature.return_type,
+            [(a.name, a.type, a.value) for a in signature.arguments],
+        )
+        for signature in (
+            parse_signature(s, name) for s in overload_signatures(name, doc)
+        )
+    ]
+
+
+def normalize(
+    overloads: list[tuple[str, list[tuple[str, str, str | None]]]],
+) -> list[tuple[str, list[tuple[str, str, str | None]]]]:
+    return [
+        (r.strip(), [(n.strip(), t.strip(), v) for n, t, v in args])
+        for r, args in overloads
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser("benchmark of pybind11 docstring parsing")
+    parser.add_argument("-n", "--functions", type=int, default=5000)
+    parser.add_argument("-r", "--repeat", type=int, default=5)
+    parser.add_argument(
+        "--names",
+        type=int,
+        default=1000,
+        help="number of distinct function names - the previous implementation "
+        "compiles one regex per name, which exceeds the cache of re above 512",
+    )
+    parser.add_argument("-s", "--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    corpus = [
+        (f"fn{i % args.names}", make_docstring(rng, f"fn{i % args.names}"))
+        for i in range(args.functions)
+    ]
+
+    mismatches = sum(
+        normalize(legacy_parse(name, doc)) != normalize(parse(name, doc))
+        for name, doc in corpus
+    )
+
+    n_signatures = sum(len(overload_signatures(name, doc)) for name, doc in corpus)
+    print(
+        f"{len(corpus)} functions, {n_signatures} signatures, "
+        f"{mismatches} mismatches with the previous implementation"
+    )
+
+    for label, fn in (("regex + magic_split", legacy_parse), ("lexer/parser", parse)):
+        best = min(
+            timeit.repeat(
+                lambda fn=fn: [fn(name, doc) for name, doc in corpus],
+                number=1,
+                repeat=args.repeat,
+            )
+        )
+        print(
+            f"{label:>20}: {best * 1e3:8.1f} ms"
+            f" ({best / n_signatures * 1e6:.2f} us / signature)"
+        )
+
+
+if __name__ == "__main__":
+    main()
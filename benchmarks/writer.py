@@ -0,0 +1,68 @@
+"""
+Benchmark of the rendering of the stubs, i.e., of mo2.stubs.generator.writer.Writer,
+on a full model built from a snapshot (see --capture in the README).
+
+    python benchmarks/writer.py SNAPSHOT CONFIG [-r REPEAT]
+"""
+
+import argparse
+import logging
+import timeit
+from pathlib import Path
+
+from mo2.stubs.generator.__main__ import extract_objects
+from mo2.stubs.generator.build import process_object
+from mo2.stubs.generator.parser import is_enum
+from mo2.stubs.generator.register import MobaseRegister
+from mo2.stubs.generator.snapshot import ClassInfo, load_snapshot
+from mo2.stubs.generator.utils import Settings, load_settings
+from mo2.stubs.generator.writer import Writer
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser("benchmark of the rendering of the stubs")
+    parser.add_argument("snapshot", type=Path)
+    parser.add_argument("config", type=Path)
+    parser.add_argument("-r", "--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    modules = load_snapshot(args.snapshot)
+    with open(args.config, "r") as fp:
+        config = load_settings(fp)
+
+    # build the full model, as done by the generator
+    register = MobaseRegister()
+    models: list[tuple[str, Settings, list[str]]] = []
+    for name, module in modules.items():
+        settings = Settings(register, config, module=name)
+        objects = sorted(
+            extract_objects(module, ["IPlugin"] if name == "mobase" else []),
+            key=lambda e: (isinstance(e[1], ClassInfo), not is_enum(e[1]), e[0]),
+        )
+        for n, o in objects:
+            register.add_object(n, o)
+        for n, o in objects:
+            process_object(register, settings, n, o)
+        models.append((name, settings, [n for n, _o in objects]))
+
+    def render() -> int:
+        size = 0
+        for name, settings, names in models:
+            writer = Writer(package=name, settings=settings)
+            for n in names:
+                writer.print_object(register.get_object(n))
+            size += len(writer.take())
+        return size
+
+    size = render()
+    best = min(timeit.repeat(render, number=1, repeat=args.repeat))
+    print(
+        f"{sum(len(names) for _n, _s, names in models)} objects, {size} characters"
+        f" rendered in {best * 1e3:.2f} ms (best of {args.repeat})"
+    )
+
+
+if __name__ == "__main__":
+    main()
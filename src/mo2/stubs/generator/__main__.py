@@ -1,43 +1,70 @@
 import argparse
-import inspect
 import logging
-import subprocess
+import sys
+import threading
+import time
 import types
-from collections.abc import Sequence
+from collections.abc import Mapping, Sequence
 from pathlib import Path
-from typing import Callable
-
+from typing import Any, Callable, NamedTuple
+
+from .build import (
+    ComponentMember,
+    LogHandler,
+    build_component,
+    group_objects,
+    init_worker,
+    join_fragments,
+    make_module_objects,
+    process_module_objects,
+    process_object,
+    render_module_objects,
+    sort_logs,
+    stub_key,
+)
+from .cache import Fragment, FragmentCache, ObjectLog, generator_hash
 from .loader import load_mobase
-from .mtypes import Class, Constant, Enum, Function, PyTyping
 from .parser import is_enum
+from .pyqt import get_pyqt_index, load_pyqt_index
 from .register import MobaseRegister
-from .utils import Settings, clean_class
-from .writer import Writer, is_list_of
+from .signatures import parsed_docstrings
+from .snapshot import (
+    ClassInfo,
+    ModuleInfo,
+    ObjectInfo,
+    capture_module,
+    load_snapshot,
+    save_snapshot,
+)
+from .timing import (
+    add_counters,
+    dump_profiles,
+    enable_profiling,
+    log_slowest,
+    record_parts,
+    record_time,
+    recorded_times,
+    timed,
+    write_report,
+)
+from .utils import Coverage, Settings, load_settings
+from .writer import Writer
 
 LOGGER = logging.getLogger(__package__)
 
 
 def extract_objects(
-    module: object, skips: Sequence[str] = []
-) -> list[tuple[str, object]]:
-    objects: list[tuple[str, object]] = []
-
-    assert hasattr(module, "__name__")
-    module_name: str = module.__name__  # type: ignore
-
-    for name in dir(module):
-        if name.startswith("__") or name in skips:
-            continue
-
-        obj = getattr(module, name)
+    module: ModuleInfo, skips: Sequence[str] = []
+) -> list[tuple[str, ObjectInfo]]:
+    objects: list[tuple[str, ObjectInfo]] = []
 
-        # skip submodules
-        if inspect.ismodule(obj):
+    for name, obj in module.objects:
+        if name in skips:
             continue
 
         # skip imports - type object have wrong __module__?
-        if hasattr(obj, "__module__") and obj.__module__ != module_name:
-            if obj.__module__ != types.__name__ or hasattr(types, name):
+        if obj.module is not None and obj.module != module.name:
+            if obj.module != types.__name__ or hasattr(types, name):
                 continue
 
         objects.append((name, obj))
@@ -86,20 +113,491 @@ def add_mobase_widgets_header(writer: Writer):
     )
 
 
+def format_stubs(paths: Sequence[Path]) -> None:
+    """
+    Format the given stubs files and sort their imports, with a single invocation
+    of ruff for each step.
+    """
+    import subprocess
+
+    files = [path.as_posix() for path in paths]
+
+    with timed("Formatting the stubs with ruff"):
+        subprocess.run(["ruff", "format", "--silent", *files])
+
+    with timed("Sorting the imports of the stubs with ruff"):
+        subprocess.run(["ruff", "check", "--silent", "--select", "I", "--fix", *files])
+
+
+def _load_fragments(
+    cache: FragmentCache, members: dict[str, list[ComponentMember]]
+) -> tuple[dict[str, Fragment], list[ObjectLog], dict[str, str]]:
+    """
+    Load the fragments of the given components, and the logs emitted while building
+    them, from the cache.
+
+    An object is either reused with its whole component, or rebuilt with it.
+
+    Returns:
+        A tuple (fragments, logs, keys) where fragments and logs contain the
+        fragments and logs found in the cache, and keys maps the root of the
+        components not found in the cache to their key.
+    """
+    fragments: dict[str, Fragment] = {}
+    logs: list[ObjectLog] = []
+    keys: dict[str, str] = {}
+    for root, component in members.items():
+        key = cache.make_key(component)
+        cached = cache.load(key)
+        if cached is None:
+            keys[root] = key
+            continue
+
+        component_fragments, component_logs = cached
+        if component_fragments.keys() == {n for _m, n, _o, _s in component}:
+            fragments.update(component_fragments)
+            logs.extend(component_logs)
+        else:
+            keys[root] = key
+
+    return fragments, logs, keys
+
+
+def _build_components(
+    jobs: int,
+    members: dict[str, list[ComponentMember]],
+    fragments: dict[str, Fragment],
+    module_objects: dict[str, list[tuple[str, ObjectInfo]]],
+    config: dict[str, Any] | None,
+) -> list[ObjectLog]:
+    """
+    Build and render the components not in fragments using a pool of processes, and
+    add their fragments to fragments.
+
+    Returns:
+        The logs emitted while building the components.
+    """
+    # imported only here, multiprocessing is a large part of the startup time
+    from concurrent.futures import ProcessPoolExecutor
+
+    pending = [
+        [(m, n) for m, n, _o, _s in component]
+        for component in members.values()
+        if any(n not in fragments for _m, n, _o, _s in component)
+    ]
+
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=init_worker,
+        initargs=(
+            module_objects,
+            config,
+            get_pyqt_index(),
+            parsed_docstrings(),
+            LOGGER.level,
+        ),
+    ) as executor:
+        # submit the biggest components first to balance the load
+        futures = {
+            index: executor.submit(build_component, pending[index])
+            for index in sorted(
+                range(len(pending)), key=lambda i: len(pending[i]), reverse=True
+            )
+        }
+
+        logs: list[ObjectLog] = []
+        for index in range(len(pending)):
+            component_fragments, component_logs, counts = futures[index].result()
+            logs.extend(component_logs)
+            fragments.update(component_fragments)
+            add_counters(counts)
+
+    return logs
+
+
+def _generate_module(
+    register: MobaseRegister,
+    settings: Settings,
+    name: str,
+    objects: list[tuple[str, ObjectInfo]],
+    fragments: dict[str, Fragment],
+    logs: list[ObjectLog],
+    output_path: Path,
+    header: Callable[[Writer], None],
+) -> Path:
+    """
+    Build, render and write the stubs of a module, reusing the given fragments and
+    adding the new ones.
+
+    The logs emitted while building the objects are added to logs, which may already
+    contain the logs of reused objects, and the logs of the module are emitted in the
+    order of a serial build once the module is built.
+
+    Returns:
+        The path of the stubs file.
+    """
+    handler = LogHandler()
+    try:
+        return _build_module(
+            register, settings, name, objects, fragments, handler, output_path, header
+        )
+    finally:
+        logs.extend(handler.logs)
+        positions = {n: index for index, (n, _o) in enumerate(objects)}
+        for record in sort_logs((log for log in logs if log.module == name), positions):
+            LOGGER.handle(record)
+
+
+def _build_module(
+    register: MobaseRegister,
+    settings: Settings,
+    name: str,
+    objects: list[tuple[str, ObjectInfo]],
+    fragments: dict[str, Fragment],
+    handler: LogHandler,
+    output_path: Path,
+    header: Callable[[Writer], None],
+) -> Path:
+    """
+    Build, render and write the stubs of a module as _generate_module(), keeping the
+    logs emitted while building the objects in the given handler.
+    """
+    for n, o in objects:
+        register.add_object(n, o)
+
+    # Process everything (except objects whose stubs are already rendered):
+    # build the objects (and their bases) before processing them
+    names = [n for n, _o in objects if n not in fragments]
+    with timed("Building the objects of {}".format(name)):
+        make_module_objects(register, handler, name, names)
+
+    process_module_objects(register, settings, handler, name, names)
+    record_parts(" of {}".format(name))
+
+    register.release_raw_objects()
+
+    output_folder = output_path
+    if name != "mobase":
+        output_folder = output_path.joinpath(
+            name.replace("mobase.", "").replace(".", "/")
+        )
+
+    # create directory if required
+    output_folder.mkdir(parents=True, exist_ok=True)
+
+    # sort the stubs
+    stub_keys: dict[str, tuple[int, ...]] = {
+        n: fragments[n].key
+        if n in fragments
+        else stub_key(register.class_graph, register.get_object(n))
+        for n, _o in objects
+    }
+    stub_names = sorted(stub_keys, key=lambda n: stub_keys[n])
+
+    # render the objects that are not in the cache
+    writer = Writer(package=name, settings=settings)
+    with timed("Rendering the stubs of {}".format(name)):
+        fragments.update(
+            render_module_objects(
+                register,
+                writer,
+                handler,
+                name,
+                [n for n in stub_names if n not in fragments],
+            )
+        )
+
+    with timed("Writing the stubs of {}".format(name)):
+        # the __future__ import must be at the beginning
+        writer.print_imports([("__future__", ["annotations"])])
+        writer.print_version(settings.version)
+
+        header(writer)
+
+        header_text = writer.take()
+        body = join_fragments([fragments[n] for n in stub_names])
+
+        # the imports are followed by a blank line only if something follows them
+        if not body:
+            header_text = header_text.removesuffix("\n")
+
+        # write everything
+        path = output_folder.joinpath("__init__.pyi")
+        with open(path, "w") as output:
+            output.write(header_text + body)
+
+    return path
+
+
+def _print_coverage(
+    module: str, coverages: Sequence[Coverage], unknown_objects: Sequence[str]
+) -> bool:
+    """
+    Print the coverage of the objects of a module by the settings.
+
+    Returns:
+        True if all the members are in the settings and all the settings match a
+        member, False otherwise.
+    """
+    documented = sum(len(c.documented) for c in coverages)
+    total = documented + sum(len(c.undocumented) for c in coverages)
+    print(
+        "{}: {} of {} members documented ({:.1%}).".format(
+            module, documented, total, documented / total if total else 1
+        )
+    )
+
+    for c in coverages:
+        print(
+            "  {}: {}/{}".format(
+                c.name, len(c.documented), len(c.documented) + len(c.undocumented)
+            )
+        )
+        if c.undocumented:
+            print("    missing: {}".format(", ".join(c.undocumented)))
+        if c.unknown:
+            print("    not in the class: {}".format(", ".join(c.unknown)))
+
+    if unknown_objects:
+        print("  not in {}: {}".format(module, ", ".join(unknown_objects)))
+
+    return not unknown_objects and all(
+        not c.undocumented and not c.unknown for c in coverages
+    )
+
+
+def _check_settings(
+    modules: Mapping[str, ModuleInfo],
+    config_path: Path | None,
+    cache: FragmentCache | None,
+) -> bool:
+    """
+    Build the objects of the given modules without rendering them, and print their
+    coverage by the settings of the given configuration.
+
+    Returns:
+        True if the settings cover all the objects and only them, False otherwise.
+    """
+    register = MobaseRegister()
+
+    module_objects, _config, module_settings = _prepare_modules(
+        register, modules, config_path, cache
+    )
+
+    complete = True
+    for name, objects in module_objects.items():
+        settings = module_settings[name]
+        coverages: list[Coverage] = []
+        # the steps of the check are profiled instead of the whole check
+        with timed("Checking the settings of {}".format(name), profile=False):
+            for n, o in objects:
+                register.add_object(n, o)
+            with timed("Building the objects of {}".format(name)):
+                register.make_objects(n for n, _o in objects)
+            for n, o in objects:
+                process_object(register, settings, n, o, coverages)
+            record_parts(" of {}".format(name))
+
+            unknown_objects = settings.unknown_objects([n for n, _o in objects])
+
+        complete = _print_coverage(name, coverages, unknown_objects) and complete
+
+    return complete
+
+
+class BuildJob(NamedTuple):
+    """
+    Stubs to build with --batch.
+    """
+
+    config: Path | None
+
+    # not used with --check, which does not write the stubs
+    output: Path
+
+    # snapshot of the modules, or None to use INSTALL_DIR or --snapshot
+    snapshot: Path | None = None
+
+
+def _load_modules(
+    install_dir: Path | None, snapshot_path: Path | None, capture_path: Path | None
+) -> dict[str, ModuleInfo]:
+    """
+    Load the introspection data of the modules from a snapshot, or from mobase in the
+    given installation directory (saved to capture_path if not None).
+    """
+    modules: dict[str, ModuleInfo]
+    if snapshot_path is not None:
+        with timed("Loading the snapshot"):
+            modules = load_snapshot(snapshot_path)
+    else:
+        assert install_dir is not None
+
+        with timed("Loading mobase"):
+            # load mobase (cannot simply do "import mobase")
+            mobase = load_mobase(install_dir)
+            modules = {
+                "mobase": capture_module(mobase),  # type: ignore
+                "mobase.widgets": capture_module(mobase.widgets),  # type: ignore
+            }
+
+        log_slowest("introspection")
+
+        if capture_path is not None:
+            save_snapshot(capture_path, modules.values())
+
+    return modules
+
+
+def _prepare_modules(
+    register: MobaseRegister,
+    modules: Mapping[str, ModuleInfo],
+    config_path: Path | None,
+    cache: FragmentCache | None,
+) -> tuple[
+    dict[str, list[tuple[str, ObjectInfo]]], dict[str, Any] | None, dict[str, Settings]
+]:
+    """
+    Extract the objects of the given modules, in processing order, and load their
+    settings from the given configuration (through the cache if not None).
+
+    Returns:
+        A tuple (objects, config, settings) containing the objects and the settings
+        of each module, and the content of the configuration file.
+    """
+    # list of objects directly in mobase
+    module_objects: dict[str, list[tuple[str, ObjectInfo]]] = {
+        "mobase": extract_objects(
+            modules["mobase"],
+            [
+                # the "real" IPlugin is IPluginBase
+                "IPlugin",
+            ],
+        ),
+        "mobase.widgets": extract_objects(modules["mobase.widgets"]),
+    }
+
+    # load settings from the configuration
+    config: dict[str, Any] | None = None
+    with timed("Loading the configuration"):
+        if config_path is not None and cache is not None:
+            config = cache.load_config(config_path)
+        elif config_path is not None:
+            with open(config_path, "r") as fp:
+                config = load_settings(fp)
+
+        module_settings: dict[str, Settings] = {
+            name: Settings(register, config, module=name) for name in module_objects
+        }
+
+    # enum first, and then alphabetical, should be fine with the __future__ import
+    for name, objects in module_objects.items():
+        module_objects[name] = sorted(
+            objects,
+            key=lambda e: (isinstance(e[1], ClassInfo), not is_enum(e[1]), e[0]),
+        )
+
+    return module_objects, config, module_settings
+
+
+def _build_stubs(
+    modules: Mapping[str, ModuleInfo],
+    config_path: Path | None,
+    output_path: Path,
+    cache: FragmentCache | None,
+    jobs: int,
+) -> tuple[list[Path], list[tuple[str, dict[str, Fragment], list[ObjectLog]]]]:
+    """
+    Build and write the stubs of the given modules with the given configuration.
+
+    Returns:
+        A tuple (paths, entries) containing the paths of the stubs files and the
+        fragments and logs of the rebuilt components to store in the cache, by key.
+    """
+    # create the register
+    register = MobaseRegister()
+
+    # headers
+    module_headers: dict[str, Callable[[Writer], None]] = {
+        "mobase": add_mobase_header,
+        "mobase.widgets": add_mobase_widgets_header,
+    }
+
+    module_objects, config, module_settings = _prepare_modules(
+        register, modules, config_path, cache
+    )
+
+    # components of objects that must be built together
+    components, members = group_objects(module_objects, module_settings)
+
+    # fragments and logs of all the objects (the logs of the objects reused from the
+    # cache or built in other processes are emitted with the logs of their module),
+    # and the cache keys of the components whose fragments need to be stored
+    fragments: dict[str, Fragment] = {}
+    logs: list[ObjectLog] = []
+    component_keys: dict[str, str] = {}
+    if cache is not None:
+        fragments, logs, component_keys = _load_fragments(cache, members)
+        LOGGER.info(
+            "Reusing {} of {} objects from the cache.".format(
+                len(fragments), len(components)
+            )
+        )
+
+    if jobs > 1:
+        with timed("Building the stubs in {} processes".format(jobs)):
+            logs.extend(
+                _build_components(jobs, members, fragments, module_objects, config)
+            )
+
+    stubs_paths: list[Path] = []
+    for name, objects in module_objects.items():
+        # the steps of the generation are profiled instead of the whole generation
+        with timed("Generating the stubs of {}".format(name), profile=False):
+            stubs_paths.append(
+                _generate_module(
+                    register,
+                    module_settings[name],
+                    name,
+                    objects,
+                    fragments,
+                    logs,
+                    output_path,
+                    module_headers[name],
+                )
+            )
+
+    object_logs: dict[str, list[ObjectLog]] = {}
+    for log in logs:
+        object_logs.setdefault(log.name, []).append(log)
+
+    entries = [
+        (
+            key,
+            {n: fragments[n] for _m, n, _o, _s in members[root]},
+            [log for _m, n, _o, _s in members[root] for log in object_logs.get(n, [])],
+        )
+        for root, key in component_keys.items()
+    ]
+
+    return stubs_paths, entries
+
+
 def main() -> None:
     parser = argparse.ArgumentParser("stubs generator for the MO2 python interface")
     parser.add_argument(
         "install_dir",
         metavar="INSTALL_DIR",
         type=Path,
+        nargs="?",
         default=None,
-        help="installation directory of Mod Organizer 2",
+        help="installation directory of Mod Organizer 2 (not required with --snapshot)",
     )
     parser.add_argument(
         "-o",
         "--output",
         type=Path,
-        default=Path("stubs/setup/mobase-stubs"),
+        default=None,
         help="output folder (default stubs/setup/mobase-stubs)",
     )
     parser.add_argument(
@@ -115,136 +613,202 @@ def main() -> None:
         default=None,
         help="configuration file",
     )
+    parser.add_argument(
+        "--pyqt-index",
+        type=Path,
+        default=None,
+        help="static table of PyQt6 symbols to use instead of importing PyQt6",
+    )
+    parser.add_argument(
+        "--capture",
+        type=Path,
+        default=None,
+        metavar="SNAPSHOT",
+        help="save the introspection data of mobase to a snapshot file (compressed "
+        "if the name ends with .gz) before generating the stubs",
+    )
+    parser.add_argument(
+        "--snapshot",
+        type=Path,
+        default=None,
+        help="generate the stubs from a snapshot file created with --capture instead "
+        "of loading mobase from INSTALL_DIR",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=None,
+        help="directory of the cache of rendered stubs, only objects whose "
+        "introspection data or settings changed are rebuilt (the cache grows with "
+        "each configuration and version of mobase, and can be deleted at any time)",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="number of processes used to build the stubs (default 1)",
+    )
+    parser.add_argument(
+        "--no-format",
+        action="store_true",
+        help="do not run ruff on the generated stubs, which are already formatted",
+    )
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        default=None,
+        metavar="REPORT",
+        help="write the wall and CPU times of each step and the counters of the hot "
+        "paths (e.g., parsed types and signatures, cache hits) to a JSON file",
+    )
+    parser.add_argument(
+        "--profile-dir",
+        type=Path,
+        default=None,
+        help="profile each step with cProfile and dump the statistics of the five "
+        "slowest steps to .prof files in this directory",
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="only compare the configuration with the objects of mobase and print the "
+        "coverage of each class, without writing the stubs",
+    )
+    parser.add_argument(
+        "--batch",
+        type=Path,
+        nargs="+",
+        action="append",
+        default=None,
+        metavar="PATH",
+        help="CONFIG OUTPUT [SNAPSHOT], build the stubs for the configuration file "
+        "CONFIG in the folder OUTPUT, from SNAPSHOT or from INSTALL_DIR or --snapshot, "
+        "can be repeated to build several versions in a single process (replaces -c "
+        "and -o), OUTPUT is not used with --check",
+    )
 
     args = parser.parse_args()
 
+    build_jobs: list[BuildJob]
+    if args.batch is not None:
+        if args.config is not None or args.output is not None:
+            parser.error("--config and --output cannot be used with --batch")
+        if any(len(values) not in (2, 3) for values in args.batch):
+            parser.error("--batch expects CONFIG OUTPUT [SNAPSHOT]")
+        build_jobs = [BuildJob(*values) for values in args.batch]
+    else:
+        build_jobs = [
+            BuildJob(args.config, args.output or Path("stubs/setup/mobase-stubs"))
+        ]
+
+    if args.install_dir is None and args.snapshot is None:
+        if any(job.snapshot is None for job in build_jobs):
+            parser.error("one of INSTALL_DIR or --snapshot is required")
+    if args.capture is not None and args.snapshot is not None:
+        parser.error("--capture cannot be used with --snapshot")
+
     logging.basicConfig()
     LOGGER.setLevel(logging.WARNING)
 
     if args.verbose:
         LOGGER.setLevel(logging.INFO)
 
-    output_path: Path = args.output
-    config_path: Path | None = args.config
-
-    # create the register
-    register = MobaseRegister()
+    install_dir: Path | None = args.install_dir
+    snapshot_path: Path | None = args.snapshot
+    cache_dir: Path | None = args.cache_dir
+    jobs: int = args.jobs
 
-    # load mobase (cannot simply do "import mobase")
-    mobase = load_mobase(Path(args.install_dir))
+    if args.profile_dir is not None:
+        enable_profiling()
 
-    # headers
-    module_headers: dict[str, Callable[[Writer], None]] = {
-        "mobase": add_mobase_header,
-        "mobase.widgets": add_mobase_widgets_header,
-    }
+    if args.pyqt_index is not None:
+        load_pyqt_index(args.pyqt_index)
 
-    # list of objects directly in mobase
-    module_objects: dict[str, list[tuple[str, object]]] = {
-        "mobase": extract_objects(
-            mobase,
-            [
-                # the "real" IPlugin is IPluginBase
-                "IPlugin",
-            ],
-        ),
-        "mobase.widgets": extract_objects(mobase.widgets),  # type: ignore
-    }
+    # the modules of each snapshot (None for INSTALL_DIR or --snapshot) are loaded
+    # once, the PyQt6 index, types and parsed signatures are shared by all the builds
+    loaded_modules: dict[Path | None, dict[str, ModuleInfo]] = {}
 
-    for name, objects in module_objects.items():
-        # load settings from the configuration
-        settings: Settings = Settings(register)
-        if config_path is not None:
-            with open(config_path, "r") as fp:
-                settings = Settings(register, fp, module=name)
-
-        for n, o in objects:
-            register.add_object(n, o)
-
-        # enum first, and then alphabetical, should be fine with the __future__ import
-        objects = sorted(
-            objects, key=lambda e: (isinstance(e[1], type), not is_enum(e[1]), e[0])
+    cache: FragmentCache | None = None
+    if cache_dir is not None:
+        cache = FragmentCache(cache_dir, generator_hash())
+        LOGGER.info(
+            "Loaded {} parsed docstrings from the cache.".format(
+                cache.load_docstrings()
+            )
         )
 
-        # Process everything:
-        for n, o in objects:
-            # Create the corresponding object:
-            c = register.make_object(n, o)
+    start = time.perf_counter()
 
-            if isinstance(c, Class):
-                # Clean the class (e.g., remove duplicates methods due to wrappers):
-                clean_class(c)
+    # with --check, whether all the configurations are complete
+    complete = True
 
-                # Path the class using the configuration:
-                settings.patch_class(c)
+    stubs_paths: list[Path] = []
+    cache_entries: list[tuple[str, dict[str, Fragment], list[ObjectLog]]] = []
+    for job in build_jobs:
+        job_start = time.perf_counter()
 
-            elif isinstance(c, (PyTyping, Constant)):
-                ...
-
-            elif is_list_of(c, Function):
-                settings.patch_functions(c)
+        if job.snapshot not in loaded_modules:
+            loaded_modules[job.snapshot] = _load_modules(
+                install_dir, job.snapshot or snapshot_path, args.capture
+            )
 
-            else:
-                LOGGER.critical(
-                    "Cannot generated stubs for {}, unsupported object type.".format(n)
+        if args.check:
+            complete = (
+                _check_settings(loaded_modules[job.snapshot], job.config, cache)
+                and complete
+            )
+        else:
+            paths, entries = _build_stubs(
+                loaded_modules[job.snapshot], job.config, job.output, cache, jobs
+            )
+            stubs_paths.extend(paths)
+            cache_entries.extend(entries)
+
+        record_time("batch", job.output.as_posix(), time.perf_counter() - job_start)
+
+    # format the stubs while the cache is being updated
+    formatter: threading.Thread | None = None
+    if not args.no_format and stubs_paths:
+        formatter = threading.Thread(target=format_stubs, args=(stubs_paths,))
+        formatter.start()
+
+    if cache is not None:
+        with timed("Updating the cache"):
+            for key, fragments, logs in cache_entries:
+                cache.store(key, fragments, logs)
+            cache.store_docstrings()
+            pruned = cache.prune()
+        if pruned:
+            LOGGER.info(
+                "Removed the cache of {} other versions of the generator.".format(
+                    pruned
                 )
-
-        output_folder = output_path
-        if name != "mobase":
-            output_folder = output_path.joinpath(
-                name.replace("mobase.", "").replace(".", "/")
             )
 
-        # create directory if required
-        output_folder.mkdir(parents=True, exist_ok=True)
-
-        # sort the stubs
-        def _key_fn(o: Class | Constant | list[Function] | PyTyping) -> tuple[int, ...]:
-            # order is PyTyping -> Constant -> Function -> Enum -> Top-Level Class -> Child Level Classes
-            return (
-                not isinstance(o, PyTyping),
-                not isinstance(o, Constant),
-                not isinstance(o, list),
-                not isinstance(o, Enum),
-                isinstance(o, Class) and len(o.all_bases),
-            )
+    if formatter is not None:
+        formatter.join()
 
-        stub_objects = sorted(
-            (register.get_object(n) for n, _o in objects), key=_key_fn
+    if args.batch is not None:
+        print(
+            "{} {} versions of the stubs in {:.2f}s:".format(
+                "Checked" if args.check else "Built",
+                len(build_jobs),
+                time.perf_counter() - start,
+            )
         )
+        for output, seconds in recorded_times("batch").items():
+            print("  {} in {:.2f}s".format(output, seconds))
 
-        # write everything
-        with open(output_folder.joinpath("__init__.pyi"), "w") as output:
-            writer = Writer(package=name, output=output, settings=settings)
-
-            # the __future__ import must be at the beginning
-            writer.print_imports([("__future__", ["annotations"])])
-            writer.print_version(settings.version)
-
-            module_headers[name](writer)
+    if args.profile is not None:
+        write_report(args.profile)
 
-            for c in stub_objects:
-                writer.print_object(c)
+    if args.profile_dir is not None:
+        for path in dump_profiles(args.profile_dir):
+            LOGGER.info("Profile written to {}.".format(path))
 
-        subprocess.run(
-            [
-                "ruff",
-                "format",
-                "--silent",
-                output_folder.joinpath("__init__.pyi").as_posix(),
-            ]
-        )
-        subprocess.run(
-            [
-                "ruff",
-                "check",
-                "--silent",
-                "--select",
-                "I",
-                "--fix",
-                output_folder.joinpath("__init__.pyi").as_posix(),
-            ]
-        )
+    if not complete:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,355 @@
+import logging
+from collections import defaultdict
+from collections.abc import Generator, Iterable, Mapping, Sequence
+from contextlib import contextmanager
+from typing import Any
+
+from .cache import Fragment, LogStage, ObjectLog, make_components
+from .mtypes import Class, Constant, Enum, Function, PyTyping
+from .pyqt import set_pyqt_index
+from .register import ClassGraph, MobaseRegister
+from .signatures import ParsedSignature, add_parsed_docstrings
+from .snapshot import ObjectInfo
+from .timing import counters, timed_part
+from .utils import Coverage, Settings, clean_class
+from .writer import Writer, is_list_of
+
+LOGGER = logging.getLogger(__package__)
+
+# module, name, introspection data and settings of an object
+type ComponentMember = tuple[str, str, ObjectInfo, dict[str, object]]
+
+
+def stub_key(
+    graph: ClassGraph, o: Class | Constant | list[Function] | PyTyping
+) -> tuple[int, ...]:
+    """
+    Key used to sort the objects of a module in the stubs.
+    """
+    # order is PyTyping -> Constant -> Function -> Enum -> Classes by depth
+    return (
+        not isinstance(o, PyTyping),
+        not isinstance(o, Constant),
+        not isinstance(o, list),
+        not isinstance(o, Enum),
+        graph.depth(o) if isinstance(o, Class) else 0,
+    )
+
+
+def process_object(
+    register: MobaseRegister,
+    settings: Settings,
+    name: str,
+    info: ObjectInfo,
+    coverages: list[Coverage] | None = None,
+) -> None:
+    """
+    Create, clean and patch the object with the given name, timing the cleaning and
+    the patching with timed_part().
+
+    Args:
+        coverages: If not None, the coverage of the object by the settings is added
+            to this list before patching it.
+    """
+    # Create the corresponding object:
+    c = register.make_object(name, info)
+
+    if isinstance(c, Class):
+        # Clean the class (e.g., remove duplicates methods due to wrappers):
+        with timed_part("Cleaning the classes"):
+            clean_class(c, register.class_graph)
+
+        if coverages is not None:
+            coverages.extend(settings.check_class(c))
+
+        # Path the class using the configuration:
+        with timed_part("Patching the objects"):
+            settings.patch_class(c)
+
+    elif isinstance(c, (PyTyping, Constant)):
+        ...
+
+    elif is_list_of(c, Function):
+        if coverages is not None:
+            coverages.append(settings.check_functions(c))
+
+        with timed_part("Patching the objects"):
+            settings.patch_functions(c)
+
+    else:
+        LOGGER.critical(
+            "Cannot generated stubs for {}, unsupported object type.".format(name)
+        )
+
+
+def render_fragment(
+    writer: Writer, graph: ClassGraph, o: Class | Constant | list[Function] | PyTyping
+) -> Fragment:
+    """
+    Render the given object using the given writer, whose buffer must be empty.
+    """
+    writer.print_object(o)
+    return Fragment(stub_key(graph, o), writer.take())
+
+
+def _is_statement(fragment: Fragment) -> bool:
+    # PyTyping or Constant, see stub_key()
+    return not (fragment.key[0] and fragment.key[1])
+
+
+def _is_function(fragment: Fragment) -> bool:
+    # list of Function, see stub_key()
+    return fragment.key[:3] == (True, True, False)
+
+
+def join_fragments(fragments: Sequence[Fragment]) -> str:
+    """
+    Join the given fragments of a module, sorted using their keys, with the blank lines
+    ruff format uses in stubs: consecutive typings and constants, and functions
+    following a function without body, are not separated, and every other object is
+    followed by a blank line.
+    """
+    parts: list[str] = []
+    for index, fragment in enumerate(fragments):
+        if index:
+            previous = fragments[index - 1]
+            if _is_statement(previous):
+                blank = not _is_statement(fragment)
+            else:
+                blank = not (
+                    _is_function(previous)
+                    and _is_function(fragment)
+                    and previous.text.endswith(": ...\n")
+                )
+            if blank:
+                parts.append("\n")
+        parts.append(fragment.text)
+    return "".join(parts)
+
+
+def group_objects(
+    module_objects: Mapping[str, Sequence[tuple[str, ObjectInfo]]],
+    module_settings: Mapping[str, Settings],
+) -> tuple[dict[str, str], dict[str, list[ComponentMember]]]:
+    """
+    Group the given objects in components of objects that must be built together
+    (see make_components()).
+
+    Returns:
+        A tuple (components, members) where components maps each object to the root
+        of its component, and members maps the root of each component to its
+        members, in processing order.
+    """
+    objects = {
+        n: (m, o, module_settings[m].get_object_settings(n))
+        for m, objs in module_objects.items()
+        for n, o in objs
+    }
+    components = make_components({n: (o, s) for n, (_m, o, s) in objects.items()})
+
+    members: dict[str, list[ComponentMember]] = defaultdict(list)
+    for n, (m, o, s) in objects.items():
+        members[components[n]].append((m, n, o, s))
+
+    return components, members
+
+
+class LogHandler(logging.Handler):
+    """
+    Handler keeping the logs emitted while building the objects of a module, with the
+    object and the stage of the build that emitted them, so that the logs of objects
+    built in another process or loaded from the cache can be emitted in the order of
+    a serial build (see sort_logs()).
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.logs: list[ObjectLog] = []
+
+        # object and stage of the build of the logs emitted from now on
+        self.module = ""
+        self.object_name = ""
+        self.stage: LogStage = (1,)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        # format the message here since the arguments may not be picklable
+        record.msg = record.getMessage()
+        record.args = None
+        record.exc_info = None
+        self.logs.append(ObjectLog(self.module, self.object_name, self.stage, record))
+
+    @contextmanager
+    def capture(self) -> Generator[None, None, None]:
+        """
+        Keep the logs emitted in the enclosed code instead of emitting them.
+        """
+        handlers, propagate = LOGGER.handlers, LOGGER.propagate
+        LOGGER.handlers, LOGGER.propagate = [self], False
+        try:
+            yield
+        finally:
+            LOGGER.handlers, LOGGER.propagate = handlers, propagate
+
+
+def sort_logs(
+    logs: Iterable[ObjectLog], positions: Mapping[str, int]
+) -> list[logging.LogRecord]:
+    """
+    Sort the given logs of the objects of a module in the order of a serial build of
+    the module.
+
+    Args:
+        logs: Logs of the objects of the module.
+        positions: Index of each object in the module.
+    """
+    # the sort is stable, so the logs of an object keep their order
+    return [
+        log.record
+        for log in sorted(logs, key=lambda log: (log.stage, positions[log.name]))
+    ]
+
+
+def make_module_objects(
+    register: MobaseRegister, handler: LogHandler, module: str, names: Iterable[str]
+) -> None:
+    """
+    Construct the given objects of a module and the objects they depend on, wave by
+    wave, as MobaseRegister.make_objects(), keeping the logs in the given handler.
+    """
+    # the objects are built with their bases, so the waves of an object are the same
+    # whatever other objects are built with it
+    handler.module = module
+    with handler.capture():
+        for wave, objects in enumerate(register.dependency_waves(names)):
+            for n in objects:
+                handler.object_name, handler.stage = n, (0, wave)
+                register.make_object(n)
+
+
+def process_module_objects(
+    register: MobaseRegister,
+    settings: Settings,
+    handler: LogHandler,
+    module: str,
+    names: Iterable[str],
+) -> None:
+    """
+    Process (see process_object()) the given objects of a module, built with
+    make_module_objects(), keeping the logs in the given handler.
+    """
+    handler.module = module
+    with handler.capture():
+        for n in names:
+            handler.object_name, handler.stage = n, (1,)
+            process_object(register, settings, n, register.raw_objects[n])
+
+
+def render_module_objects(
+    register: MobaseRegister,
+    writer: Writer,
+    handler: LogHandler,
+    module: str,
+    names: Iterable[str],
+) -> dict[str, Fragment]:
+    """
+    Render the given objects of a module, processed with process_module_objects(),
+    keeping the logs in the given handler.
+
+    Returns:
+        The fragment of each object.
+    """
+    handler.module = module
+    fragments: dict[str, Fragment] = {}
+    with handler.capture():
+        for n in names:
+            obj = register.get_object(n)
+            handler.object_name, handler.stage = (
+                n,
+                (2, stub_key(register.class_graph, obj)),
+            )
+            fragments[n] = render_fragment(writer, register.class_graph, obj)
+    return fragments
+
+
+# state of the worker processes used by build_component()
+
+_register: MobaseRegister
+_settings: dict[str, Settings]
+_handler: LogHandler
+
+
+def init_worker(
+    module_objects: Mapping[str, Sequence[tuple[str, ObjectInfo]]],
+    config: dict[str, Any] | None,
+    pyqt_index: Mapping[str, str],
+    docstrings: Mapping[tuple[str, str], tuple[ParsedSignature, ...]],
+    level: int,
+) -> None:
+    """
+    Initialize a worker process for build_component().
+
+    Args:
+        module_objects: Objects of each module, as processed by the main process.
+        config: Content of the configuration file, if any.
+        pyqt_index: The PyQt6 symbol index of the main process.
+        docstrings: The parsed docstrings of the main process, e.g., from the cache.
+        level: Logging level of the main process.
+    """
+    global _register, _settings, _handler
+
+    set_pyqt_index(pyqt_index)
+    add_parsed_docstrings(docstrings)
+
+    # logs are sent back to the main process
+    _handler = LogHandler()
+    LOGGER.handlers = [_handler]
+    LOGGER.propagate = False
+    LOGGER.setLevel(level)
+
+    _register = MobaseRegister()
+    _settings = {}
+    for name, objects in module_objects.items():
+        _settings[name] = Settings(_register, config, module=name)
+
+        for n, o in objects:
+            _register.add_object(n, o)
+
+
+def build_component(
+    members: Sequence[tuple[str, str]],
+) -> tuple[dict[str, Fragment], list[ObjectLog], dict[str, int]]:
+    """
+    Build and render the objects of a component in a worker process initialized with
+    init_worker().
+
+    Objects are built and rendered module by module, as in the main process, since
+    building an object can modify the objects of its bases.
+
+    Args:
+        members: Module and name of the objects of the component, in processing
+            order.
+
+    Returns:
+        A tuple (fragments, logs, counts) containing the fragment of each object, the
+        logs emitted and the counters incremented while building the component.
+    """
+    _handler.logs = []
+    before = dict(counters())
+
+    fragments: dict[str, Fragment] = {}
+    for module in dict.fromkeys(m for m, _n in members):
+        names = [n for m, n in members if m == module]
+        make_module_objects(_register, _handler, module, names)
+        process_module_objects(_register, _settings[module], _handler, module, names)
+        fragments.update(
+            render_module_objects(
+                _register,
+                Writer(package=module, settings=_settings[module]),
+                _handler,
+                module,
+                names,
+            )
+        )
+
+    counts = {n: c - before.get(n, 0) for n, c in counters().items()}
+    return fragments, _handler.logs, {n: c for n, c in counts.items() if c}
@@ -0,0 +1,371 @@
+import hashlib
+import json
+import logging
+import os
+import pickle
+import shutil
+from collections.abc import Iterable, Mapping, Sequence
+from pathlib import Path
+from typing import Any, NamedTuple, cast
+
+from .pyqt import get_pyqt_index
+from .register import class_dependencies
+from .signatures import add_parsed_docstrings, parsed_docstrings
+from .snapshot import ClassInfo, ObjectInfo, dump_info
+from .timing import increment
+from .utils import load_settings
+
+LOGGER = logging.getLogger(__package__)
+
+
+class Fragment(NamedTuple):
+    """
+    Rendered stubs of a top-level object of a module.
+    """
+
+    # key used to sort the objects in the module
+    key: tuple[int, ...]
+
+    # the rendered stubs
+    text: str
+
+
+# stage of the build of a module during which a log is emitted: the objects are built
+# wave by wave (see MobaseRegister.dependency_waves()), then processed, then rendered
+# in the order of the stubs, i.e., (0, wave), (1,) or (2, sort key of the object)
+type LogStage = tuple[int] | tuple[int, int] | tuple[int, tuple[int, ...]]
+
+
+class ObjectLog(NamedTuple):
+    """
+    Log emitted while building a top-level object of a module.
+    """
+
+    # module and name of the object
+    module: str
+    name: str
+
+    stage: LogStage
+
+    # the log, with its message already formatted
+    record: logging.LogRecord
+
+
+def _load_stage(stage: list[int | list[int]]) -> LogStage:
+    # JSON has no tuples, and the sort key of a rendered object is a nested list
+    return cast(LogStage, tuple(tuple(v) if isinstance(v, list) else v for v in stage))
+
+
+def generator_hash() -> str:
+    """
+    Compute a hash of everything that affects the rendering besides the objects and
+    the configuration, i.e., the sources of the generator and the PyQt6 index.
+    """
+    h = hashlib.sha256()
+    for path in sorted(Path(__file__).parent.glob("*.py")):
+        h.update(path.name.encode())
+        h.update(path.read_bytes())
+    h.update(json.dumps(sorted(get_pyqt_index().items())).encode())
+    return h.hexdigest()
+
+
+def _settings_dependencies(settings: object) -> Iterable[str]:
+    if isinstance(settings, dict):
+        for key, value in cast(dict[str, Any], settings).items():
+            if key == "__bases__":
+                yield from (
+                    b for b in cast(list[str], value) if not b.startswith("PyQt")
+                )
+            else:
+                yield from _settings_dependencies(value)
+
+
+def make_components(
+    objects: Mapping[str, tuple[ObjectInfo, object]],
+) -> dict[str, str]:
+    """
+    Group the given objects in components of objects that must be built together,
+    i.e., classes related through their bases (from mobase or from the settings).
+
+    Args:
+        objects: Mapping from object name to introspection data and settings of the
+            object.
+
+    Returns:
+        A mapping from object name to the name of the first object (in the given
+        order) of its component.
+    """
+    parents = {name: name for name in objects}
+    order = {name: index for index, name in enumerate(objects)}
+
+    def _find(name: str) -> str:
+        while parents[name] != name:
+            parents[name] = parents[parents[name]]
+            name = parents[name]
+        return name
+
+    for name, (info, settings) in objects.items():
+        dependencies = list(_settings_dependencies(settings))
+        if isinstance(info, ClassInfo):
+            dependencies.extend(class_dependencies(info))
+
+        for dependency in dependencies:
+            if dependency not in parents:
+                continue
+
+            a, b = _find(name), _find(dependency)
+            if a != b:
+                # keep the first object as the root of the component
+                if order[a] > order[b]:
+                    a, b = b, a
+                parents[b] = a
+
+    return {name: _find(name) for name in objects}
+
+
+class FragmentCache:
+    """
+    On-disk cache of rendered stubs and of the logs emitted while building them, with
+    one file per component of objects (see make_components()), of the parsed
+    configuration files, and of the parsed docstrings (see
+    signatures.parse_docstring()).
+
+    The components and configuration files are stored in a sub-directory named after
+    the salt, so that the ones of other versions of the generator, which can never be
+    loaded, can be removed with prune().
+    """
+
+    def __init__(self, path: os.PathLike[Any], salt: str):
+        """
+        Args:
+            path: Directory of the cache, created if it does not exist.
+            salt: Value mixed into every key, typically generator_hash().
+        """
+        self._root = Path(path)
+        self._path = self._root.joinpath(salt)
+        self._path.mkdir(parents=True, exist_ok=True)
+        self._salt = salt
+
+        # number of parsed docstrings loaded by load_docstrings()
+        self._docstrings = 0
+
+    def make_key(self, members: Iterable[tuple[str, str, ObjectInfo, object]]) -> str:
+        """
+        Compute the key of a component.
+
+        Args:
+            members: Module, name, introspection data and settings of each object of
+                the component, in processing order.
+
+        Returns:
+            The key of the component.
+        """
+        h = hashlib.sha256(self._salt.encode())
+        for module, name, info, settings in members:
+            h.update(
+                json.dumps(
+                    [module, name, dump_info(info), settings],
+                    separators=(",", ":"),
+                    default=str,
+                ).encode()
+            )
+        return h.hexdigest()
+
+    def load(self, key: str) -> tuple[dict[str, Fragment], list[ObjectLog]] | None:
+        """
+        Load the fragments of a component and the logs emitted while building it.
+
+        The logs are the ones of the current level of the logger, a component built
+        with a higher level (e.g., without -v) is not in the cache for lower levels.
+
+        Args:
+            key: Key of the component, from make_key().
+
+        Returns:
+            A tuple (fragments, logs) containing the fragment of each object and the
+            logs of the component, or None if the component is not in the cache.
+        """
+        path = self._path.joinpath(f"{key}.json")
+        try:
+            with open(path, "r", encoding="utf-8") as fp:
+                data = json.load(fp)
+        except FileNotFoundError:
+            increment("fragments.misses")
+            return None
+        except ValueError:
+            LOGGER.warning(f"Ignoring invalid cache file {path}.")
+            increment("fragments.misses")
+            return None
+
+        level = LOGGER.getEffectiveLevel()
+        if data["level"] > level:
+            increment("fragments.misses")
+            return None
+
+        increment("fragments.hits")
+
+        fragments = {
+            name: Fragment(tuple(sort_key), text)
+            for name, (sort_key, text) in data["fragments"].items()
+        }
+        logs = [
+            ObjectLog(
+                module,
+                name,
+                _load_stage(stage),
+                logging.makeLogRecord(
+                    {
+                        "name": LOGGER.name,
+                        "levelno": levelno,
+                        "levelname": levelname,
+                        "msg": msg,
+                    }
+                ),
+            )
+            for module, name, stage, levelno, levelname, msg in data["logs"]
+            if levelno >= level
+        ]
+        return fragments, logs
+
+    def store(
+        self, key: str, fragments: Mapping[str, Fragment], logs: Sequence[ObjectLog]
+    ) -> None:
+        """
+        Store the fragments of a component and the logs emitted while building it at
+        the current level of the logger.
+
+        Args:
+            key: Key of the component, from make_key().
+            fragments: Mapping from object name to fragment.
+            logs: Logs of the objects of the component.
+        """
+        path = self._path.joinpath(f"{key}.json")
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as fp:
+            json.dump(
+                {
+                    "level": LOGGER.getEffectiveLevel(),
+                    "fragments": {
+                        name: [list(f.key), f.text] for name, f in fragments.items()
+                    },
+                    "logs": [
+                        [
+                            log.module,
+                            log.name,
+                            log.stage,
+                            log.record.levelno,
+                            log.record.levelname,
+                            log.record.getMessage(),
+                        ]
+                        for log in logs
+                    ],
+                },
+                fp,
+            )
+        os.replace(tmp_path, path)
+
+    def prune(self) -> int:
+        """
+        Remove the components and configuration files stored by other versions of the
+        generator, i.e., with another salt.
+
+        Components of previous configurations or versions of mobase are kept, since
+        they are reused when going back to them (or with --batch), so the cache still
+        grows with each distinct configuration until it is deleted.
+
+        Returns:
+            The number of removed directories.
+        """
+        count = 0
+        for path in self._root.iterdir():
+            # only the directories created by __init__(), named after a SHA-256
+            if (
+                path.is_dir()
+                and path != self._path
+                and len(path.name) == 64
+                and all(c in "0123456789abcdef" for c in path.name)
+            ):
+                shutil.rmtree(path, ignore_errors=True)
+                count += 1
+        return count
+
+    def load_config(self, path: os.PathLike[Any]) -> dict[str, Any]:
+        """
+        Load a configuration file, from the cache if it has already been parsed.
+
+        The parsed configuration is stored with pickle, which is much faster to load
+        than YAML, under a key computed from the content of the file, so a modified
+        configuration is parsed again.
+
+        Args:
+            path: Path to the configuration file.
+
+        Returns:
+            The content of the configuration file, see load_settings().
+        """
+        content = Path(path).read_bytes()
+        key = hashlib.sha256(self._salt.encode() + content).hexdigest()
+        cache_path = self._path.joinpath(f"config-{key}.pickle")
+
+        try:
+            with open(cache_path, "rb") as fp:
+                data = pickle.load(fp)
+        except FileNotFoundError:
+            increment("config.misses")
+        except (pickle.UnpicklingError, EOFError, ValueError):
+            LOGGER.warning(f"Ignoring invalid cache file {cache_path}.")
+            increment("config.misses")
+        else:
+            increment("config.hits")
+            return data
+
+        data = load_settings(content.decode("utf-8"))
+
+        tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as fp:
+            pickle.dump(data, fp, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+
+        return data
+
+    def load_docstrings(self) -> int:
+        """
+        Load the docstrings parsed in previous runs (for any version of mobase), so
+        that signatures.parse_docstring() does not parse them again.
+
+        Returns:
+            The number of parsed docstrings loaded.
+        """
+        path = self._root.joinpath("docstrings.pickle")
+        try:
+            with open(path, "rb") as fp:
+                salt, docstrings = pickle.load(fp)
+        except FileNotFoundError:
+            return 0
+        except (pickle.UnpicklingError, EOFError, ValueError):
+            LOGGER.warning(f"Ignoring invalid cache file {path}.")
+            return 0
+
+        # parsed by another version of the generator
+        if salt != self._salt:
+            return 0
+
+        add_parsed_docstrings(docstrings)
+        self._docstrings = len(docstrings)
+        return self._docstrings
+
+    def store_docstrings(self) -> None:
+        """
+        Store the docstrings parsed so far, including the ones loaded by
+        load_docstrings(), if new ones have been parsed.
+        """
+        docstrings = parsed_docstrings()
+        if len(docstrings) == self._docstrings:
+            return
+
+        path = self._root.joinpath("docstrings.pickle")
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as fp:
+            pickle.dump((self._salt, docstrings), fp, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        self._docstrings = len(docstrings)
@@ -0,0 +1,409 @@
+"""
+Structural diff of two versions of the stubs, e.g., stubs/2.5.2/mobase-stubs and
+stubs/2.5.3/mobase-stubs, reporting added, removed and changed symbols instead of
+lines.
+"""
+
+import argparse
+import ast
+import json
+import sys
+from collections import Counter
+from collections.abc import Iterable, Iterator, Sequence
+from pathlib import Path
+from typing import NamedTuple
+
+
+class Argument(NamedTuple):
+    """
+    Argument of a function in the stubs.
+    """
+
+    # name, with a * or ** prefix for variadic arguments
+    name: str
+    annotation: str | None = None
+    default: str | None = None
+
+    def __str__(self) -> str:
+        text = self.name
+        if self.annotation is not None:
+            text += f": {self.annotation}"
+        if self.default is not None:
+            text += f" = {self.default}"
+        return text
+
+
+class Signature(NamedTuple):
+    """
+    Signature of a function or of an overload of a function in the stubs.
+    """
+
+    arguments: tuple[Argument, ...]
+    returns: str | None
+
+    # decorators of the function, except @overload
+    decorators: tuple[str, ...] = ()
+
+    def __str__(self) -> str:
+        text = "({})".format(", ".join(map(str, self.arguments)))
+        if self.returns is not None:
+            text += f" -> {self.returns}"
+        return "".join(f"@{d} " for d in self.decorators) + text
+
+
+class Symbol(NamedTuple):
+    """
+    Symbol of the stubs, e.g., a class, a method or an enumeration value.
+    """
+
+    # class, enum, function, method, property, attribute, constant or value (of an
+    # enumeration)
+    kind: str
+
+    # qualified name, e.g., mobase.IFileTree.find
+    name: str
+
+    # bases of classes, type of properties, attributes and constants, and value of
+    # constants (e.g., type aliases)
+    details: tuple[str, ...] = ()
+
+    # overloads of functions and methods, in order
+    overloads: tuple[Signature, ...] = ()
+
+
+class Change(NamedTuple):
+    """
+    Difference between two versions of a symbol.
+    """
+
+    # added, removed or changed
+    change: str
+
+    kind: str
+    name: str
+
+    # description of the changes for changed symbols, and of the symbol itself
+    # (e.g., its overloads) for added and removed ones
+    details: tuple[str, ...] = ()
+
+    def __str__(self) -> str:
+        prefix = {"added": "+", "removed": "-", "changed": "~"}[self.change]
+        return "\n".join(
+            [f"{prefix} {self.kind} {self.name}", *(f"    {d}" for d in self.details)]
+        )
+
+
+def _unparse(node: ast.expr | None) -> str | None:
+    return None if node is None else ast.unparse(node)
+
+
+def _signature(node: ast.FunctionDef | ast.AsyncFunctionDef) -> Signature:
+    args = node.args
+
+    positional = args.posonlyargs + args.args
+    defaults: list[ast.expr | None] = [None] * (
+        len(positional) - len(args.defaults)
+    ) + list(args.defaults)
+
+    arguments = [
+        Argument(a.arg, _unparse(a.annotation), _unparse(d))
+        for a, d in zip(positional, defaults, strict=True)
+    ]
+    if args.vararg is not None:
+        arguments.append(
+            Argument("*" + args.vararg.arg, _unparse(args.vararg.annotation))
+        )
+    arguments.extend(
+        Argument(a.arg, _unparse(a.annotation), _unparse(d))
+        for a, d in zip(args.kwonlyargs, args.kw_defaults, strict=True)
+    )
+    if args.kwarg is not None:
+        arguments.append(
+            Argument("**" + args.kwarg.arg, _unparse(args.kwarg.annotation))
+        )
+
+    return Signature(
+        tuple(arguments),
+        _unparse(node.returns),
+        tuple(
+            d
+            for d in map(ast.unparse, node.decorator_list)
+            if d not in ("overload", "typing.overload")
+        ),
+    )
+
+
+def _symbols(
+    body: Sequence[ast.stmt], prefix: str, owner: str | None
+) -> Iterator[Symbol]:
+    """
+    Yield the symbols of the given statements, parents before their members.
+
+    Args:
+        body: The statements of a module or of a class.
+        prefix: Prefix of the qualified names of the symbols, e.g., "mobase.".
+        owner: Kind of the class (class or enum) containing the statements, or None
+            for a module.
+    """
+    # functions, by name, accumulated to merge their overloads, and properties
+    functions: dict[str, list[Signature]] = {}
+    properties: dict[str, list[str]] = {}
+
+    for node in body:
+        if isinstance(node, ast.ClassDef):
+            bases = tuple(map(ast.unparse, node.bases))
+            is_enum = any(b in ("Enum", "enum.Enum") for b in bases)
+            yield Symbol("enum" if is_enum else "class", prefix + node.name, bases)
+            yield from _symbols(
+                node.body, f"{prefix}{node.name}.", "enum" if is_enum else "class"
+            )
+
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            signature = _signature(node)
+            if "property" in signature.decorators:
+                properties[node.name] = [signature.returns or "", "read-only"]
+            elif f"{node.name}.setter" in signature.decorators:
+                properties.setdefault(node.name, ["", ""])[1] = "settable"
+            else:
+                functions.setdefault(node.name, []).append(signature)
+
+        elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            annotation = (
+                _unparse(node.annotation) if isinstance(node, ast.AnnAssign) else None
+            )
+            value = _unparse(node.value)
+            for target in targets:
+                if not isinstance(target, ast.Name):
+                    continue
+                if owner == "enum" and annotation is None:
+                    # enumeration values are "NAME = ..."
+                    yield Symbol("value", prefix + target.id)
+                elif owner is not None:
+                    yield Symbol(
+                        "attribute", prefix + target.id, (annotation or "", value or "")
+                    )
+                else:
+                    yield Symbol(
+                        "constant",
+                        prefix + target.id,
+                        (annotation or "", value or ""),
+                    )
+
+    for name, details in properties.items():
+        yield Symbol("property", prefix + name, tuple(details))
+
+    for name, overloads in functions.items():
+        yield Symbol(
+            "function" if owner is None else "method",
+            prefix + name,
+            (),
+            tuple(overloads),
+        )
+
+
+def module_name(root: Path, path: Path) -> str:
+    """
+    Name of the module of a stubs file, e.g., mobase.widgets for
+    mobase-stubs/widgets/__init__.pyi in the mobase-stubs tree.
+    """
+    if root.is_file():
+        return path.stem
+
+    package = root.name.removesuffix("-stubs")
+    parts = path.relative_to(root).with_suffix("").parts
+    if parts[-1] == "__init__":
+        parts = parts[:-1]
+    return ".".join((package, *parts))
+
+
+def load_symbols(root: Path) -> dict[str, Symbol]:
+    """
+    Load the symbols of a stubs tree or of a single stubs file.
+
+    Args:
+        root: A .pyi file, or a directory containing .pyi files (e.g., mobase-stubs).
+
+    Returns:
+        The symbols of the stubs, by qualified name.
+    """
+    paths = [root] if root.is_file() else sorted(root.rglob("*.pyi"))
+
+    symbols: dict[str, Symbol] = {}
+    for path in paths:
+        module = module_name(root, path)
+        tree = ast.parse(path.read_text(encoding="utf-8"), path.as_posix())
+        for symbol in _symbols(tree.body, module + ".", None):
+            symbols[symbol.name] = symbol
+    return symbols
+
+
+def _diff_arguments(old: Sequence[Argument], new: Sequence[Argument]) -> Iterator[str]:
+    old_arguments = {a.name: a for a in old}
+    new_arguments = {a.name: a for a in new}
+
+    for a in old:
+        b = new_arguments.get(a.name)
+        if b is None:
+            yield f"argument {a} removed"
+        elif a != b:
+            yield f"argument {a} -> {b}"
+    for b in new:
+        if b.name not in old_arguments:
+            yield f"argument {b} added"
+
+    common = [a.name for a in old if a.name in new_arguments]
+    if common != [b.name for b in new if b.name in old_arguments]:
+        yield "arguments reordered"
+
+
+def _unmatched(
+    signatures: Sequence[Signature], others: Sequence[Signature]
+) -> list[tuple[int, Signature]]:
+    # (1-based) index and signature of the overloads that are not in others
+    remaining = Counter(others)
+    unmatched: list[tuple[int, Signature]] = []
+    for index, signature in enumerate(signatures, 1):
+        if remaining[signature]:
+            remaining[signature] -= 1
+        else:
+            unmatched.append((index, signature))
+    return unmatched
+
+
+def _diff_overloads(
+    old: Sequence[Signature], new: Sequence[Signature]
+) -> Iterator[str]:
+    # overloads found in both versions are matched first, the remaining ones are
+    # paired in order, so that adding an overload does not change the others
+    old_only = _unmatched(old, new)
+    new_only = _unmatched(new, old)
+
+    for (i, a), (j, b) in zip(old_only, new_only, strict=False):
+        label = f"overload {i}" if i == j else f"overload {i} (now {j})"
+        if a.decorators != b.decorators:
+            yield "{}: decorators {} -> {}".format(
+                label, list(a.decorators), list(b.decorators)
+            )
+        for change in _diff_arguments(a.arguments, b.arguments):
+            yield f"{label}: {change}"
+        if a.returns != b.returns:
+            yield f"{label}: returns {a.returns} -> {b.returns}"
+
+    for i, a in old_only[len(new_only) :]:
+        yield f"overload {i} removed: {a}"
+    for j, b in new_only[len(old_only) :]:
+        yield f"overload {j} added: {b}"
+
+
+def _describe(symbol: Symbol) -> tuple[str, ...]:
+    if symbol.overloads:
+        return tuple(map(str, symbol.overloads))
+    if symbol.kind in ("class", "enum"):
+        return ("bases {}".format(list(symbol.details)),) if symbol.details else ()
+    text = " ".join(d for d in symbol.details if d)
+    return (text,) if text else ()
+
+
+def _diff_symbol(old: Symbol, new: Symbol) -> tuple[str, ...]:
+    changes: list[str] = []
+    if old.kind != new.kind:
+        changes.append(f"kind {old.kind} -> {new.kind}")
+    if old.details != new.details:
+        if old.kind in ("class", "enum"):
+            changes.append(f"bases {list(old.details)} -> {list(new.details)}")
+        else:
+            changes.append(
+                "{} -> {}".format(
+                    " ".join(d for d in old.details if d),
+                    " ".join(d for d in new.details if d),
+                )
+            )
+    changes.extend(_diff_overloads(old.overloads, new.overloads))
+    return tuple(changes)
+
+
+def diff_symbols(old: dict[str, Symbol], new: dict[str, Symbol]) -> list[Change]:
+    """
+    Compare two symbol tables in a single pass over each of them.
+
+    The members of added or removed symbols (e.g., the methods of a removed class) are
+    not reported.
+
+    Args:
+        old: Symbols of the old version, parents before their members.
+        new: Symbols of the new version, parents before their members.
+
+    Returns:
+        The changes, removed and changed symbols in the order of the old version,
+        followed by the added symbols in the order of the new version.
+    """
+    changes: list[Change] = []
+
+    removed: set[str] = set()
+    for name, symbol in old.items():
+        other = new.get(name)
+        if other is None:
+            removed.add(name)
+            if name.rpartition(".")[0] not in removed:
+                changes.append(Change("removed", symbol.kind, name, _describe(symbol)))
+        elif symbol != other:
+            details = _diff_symbol(symbol, other)
+            if details:
+                changes.append(Change("changed", other.kind, name, details))
+
+    added: set[str] = set()
+    for name, symbol in new.items():
+        if name not in old:
+            added.add(name)
+            if name.rpartition(".")[0] not in added:
+                changes.append(Change("added", symbol.kind, name, _describe(symbol)))
+
+    return changes
+
+
+def _summary(changes: Iterable[Change]) -> str:
+    counts = Counter(c.change for c in changes)
+    return ", ".join(f"{counts[c]} {c}" for c in ("added", "removed", "changed"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser("structural diff of two versions of the stubs")
+    parser.add_argument(
+        "old",
+        metavar="OLD",
+        type=Path,
+        help="old stubs, e.g., stubs/2.5.2/mobase-stubs or a .pyi file",
+    )
+    parser.add_argument(
+        "new",
+        metavar="NEW",
+        type=Path,
+        help="new stubs, e.g., stubs/2.5.3/mobase-stubs or a .pyi file",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="output the changes as a JSON list instead of text",
+    )
+    args = parser.parse_args()
+
+    changes = diff_symbols(load_symbols(args.old), load_symbols(args.new))
+
+    if args.json:
+        json.dump(
+            [c._asdict() | {"details": list(c.details)} for c in changes],
+            sys.stdout,
+            indent=2,
+        )
+        sys.stdout.write("\n")
+    else:
+        for change in changes:
+            print(change)
+        print(_summary(changes))
+
+    sys.exit(1 if changes else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,11 @@
 import os
 import sys
-from modulefinder import Module
+import types
 from pathlib import Path
 from typing import Any
 
 
-def load_mobase(path: os.PathLike[Any]) -> Module:
+def load_mobase(path: os.PathLike[Any]) -> types.ModuleType:
     """
     Load the mobase from the given MO2 installation path and
     returns it.
@@ -1,47 +1,130 @@
 from __future__ import annotations
 
 import re
-from collections.abc import Sequence
-from typing import Final, TypeVar
+from collections.abc import Collection, Sequence
+from typing import ClassVar, Final
+
+from .pyqt import qualify_pyqt_name
+from .timing import increment
+from .typeexpr import (
+    TypeExpr,
+    TypeName,
+    make_optional,
+    parametrize_types,
+    parse_type,
+    qualify_names,
+    rename_types,
+    render_type,
+    strip_qflags,
+)
+
+# classes whose name in the stubs differs from the name in mobase
+RENAMED_CLASSES: Final = {"IPluginBase": "IPlugin"}
+
+# the same renames, for the qualified names in types
+_RENAMED_TYPES: Final = {
+    f"mobase.{name}": f"mobase.{renamed}" for name, renamed in RENAMED_CLASSES.items()
+}
 
 
 class PyType:
     """
     Class representing a python type.
+
+    Types are interned: there is a single (immutable) instance for each normalized
+    type name, so types can be compared by identity.
     """
 
+    __slots__ = ("name", "_expr", "_typing_expr", "_typing")
+
     name: str
+    _expr: TypeExpr
+    _typing_expr: TypeExpr
+    _typing: str
 
-    def __init__(self, name: str | type):
-        # import only here since we change the path to find them
-        from PyQt6 import QtCore, QtGui, QtWidgets
+    # interned instances, by normalized name and by spelling used to create them
+    _instances: ClassVar[dict[str, PyType]] = {}
+    _spellings: ClassVar[dict[str, PyType]] = {}
 
+    def __new__(cls, name: str | type) -> PyType:
         if isinstance(name, type):
             name = name.__name__
 
-        self.name = name.strip()
+        instance = cls._spellings.get(name)
+        if instance is not None:
+            increment("PyType.hits")
+            return instance
+
+        increment("PyType.misses")
+
+        expr = parse_type(name)
 
         # replace QFlags[xxx] with xxx
-        self.name = re.sub(r"QFlags\[([^]]*)\]", r"\1", self.name)
+        expr = strip_qflags(expr)
 
         # find PyQt types
-        for m in (QtCore, QtGui, QtWidgets):
-            if self.name in dir(m):
-                self.name = "{}.{}".format(m.__name__, self.name)
+        expr = qualify_names(expr, qualify_pyqt_name)
+
+        normalized = render_type(expr)
+
+        instance = cls._instances.get(normalized)
+        if instance is None:
+            instance = super().__new__(cls)
+            typing_expr = PyType._make_typing(expr)
+            object.__setattr__(instance, "name", normalized)
+            object.__setattr__(instance, "_expr", expr)
+            object.__setattr__(instance, "_typing_expr", typing_expr)
+            object.__setattr__(instance, "_typing", render_type(typing_expr))
+
+            # setdefault so that concurrent constructions agree on the instance
+            instance = cls._instances.setdefault(normalized, instance)
+
+        return cls._spellings.setdefault(name, instance)
+
+    @staticmethod
+    def _make_typing(expr: TypeExpr) -> TypeExpr:
+        # IPluginBase -> IPlugin
+        expr = rename_types(expr, _RENAMED_TYPES)
+
+        # PathLike should be [] in the stubs
+        return parametrize_types(expr, {"os.PathLike": TypeName("str")})
+
+    @property
+    def expr(self) -> TypeExpr:
+        """
+        Returns:
+            The (normalized) expression of this type.
+        """
+        return self._expr
+
+    @property
+    def typing_expr(self) -> TypeExpr:
+        """
+        Returns:
+            The expression of the valid typing representation for this type.
+        """
+        return self._typing_expr
 
     def typing(self) -> str:
         """
         Returns:
             A valid typing representation for this type.
         """
-        # IPluginBase -> IPlugin
-        if self.name == "mobase.IPluginBase":
-            return "IPlugin"
+        return self._typing
 
-        # PathLike should be [] in the stubs
-        self.name = self.name.replace("os.PathLike", "os.PathLike[str]")
+    def optional(self, optional_names: Collection[str] = ()) -> PyType:
+        """
+        Args:
+            optional_names: Names of types that already accept None.
 
-        return self.name
+        Returns:
+            This type if it already accepts None, otherwise the union of this type
+            and None.
+        """
+        expr = make_optional(self._expr, optional_names)
+        if expr is self._expr:
+            return self
+        return PyType(render_type(expr))
 
     def is_none(self) -> bool:
         """
@@ -70,26 +153,30 @@ class PyType:
         """
         return self.name == "Any"
 
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError(f"cannot set {name}, PyType is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"cannot delete {name}, PyType is immutable")
+
+    def __reduce__(self) -> tuple[type[PyType], tuple[str]]:
+        # go through __new__ to retrieve the interned instance when unpickling
+        return (PyType, (self.name,))
+
     def __str__(self):
         return "Type({})".format(self.name)
 
     def __repr__(self):
         return str(self)
 
-    def __hash__(self):
-        return hash(self.name)
-
-    def __eq__(self, other: object) -> bool:
-        if not isinstance(other, PyType):
-            return NotImplemented
-        return self.name == other.name
-
 
 class Return:
     """
     Class representing the return value of a function (type and documentation).
     """
 
+    __slots__ = ("type", "doc")
+
     type: PyType
     doc: str
 
@@ -103,6 +190,8 @@ class Argument:
     Class representing a function argument (type and eventual default value).
     """
 
+    __slots__ = ("name", "type", "_value", "doc")
+
     # Constant representing None since None indicates no default value:
     DEFAULT_NONE = "None"
 
@@ -169,6 +258,8 @@ class Exception:
     Small class representing exception that can be raised from functions.
     """
 
+    __slots__ = ("type", "doc")
+
     type: PyType
     doc: str
 
@@ -182,6 +273,8 @@ class Function:
     Class representing a function.
     """
 
+    __slots__ = ("name", "ret", "args", "overloads", "raises", "doc", "deprecated")
+
     name: str
     ret: Return
     args: list[Argument]
@@ -218,6 +311,8 @@ class Method(Function):
     Class representing a method.
     """
 
+    __slots__ = ("cls", "abstract", "static")
+
     cls: Class
     abstract: str | bool
     static: bool
@@ -257,6 +352,8 @@ class Constant:
     Class representing a constant.
     """
 
+    __slots__ = ("name", "type", "value", "doc")
+
     name: str
     type: PyType | None
     value: object
@@ -278,6 +375,8 @@ class Property:
     Class representing a property.
     """
 
+    __slots__ = ("name", "type", "doc", "read_only")
+
     name: str
     type: PyType
     doc: str
@@ -298,6 +397,21 @@ class Class:
     Class representing a class.
     """
 
+    __slots__ = (
+        "package",
+        "name",
+        "bases",
+        "methods",
+        "constants",
+        "properties",
+        "inner_classes",
+        "outer_class",
+        "doc",
+        "abstract",
+        "deprecated",
+    )
+
+    package: str
     name: str
     bases: list[Class]
     methods: list[Method]
@@ -369,17 +483,6 @@ class Class:
             return f"{self.package}.{self.canonical_name}"
         return self.canonical_name
 
-    @property
-    def all_bases(self) -> set[Class]:
-        """
-        Returns:
-            All the bases of this class, including bases of bases and so on.
-        """
-        bases = set(self.bases)
-        for b in self.bases:
-            bases = bases.union(b.all_bases)
-        return bases
-
     def is_deprecated(self):
         return self.deprecated
 
@@ -390,6 +493,8 @@ class PyClass(Class):
     in mobase.
     """
 
+    __slots__ = ()
+
     def __init__(
         self,
         package: str,
@@ -404,6 +509,8 @@ class Enum(Class):
     Class representing an enum.
     """
 
+    __slots__ = ()
+
     def __init__(
         self, package: str, name: str, values: dict[str, int], methods: list[Method]
     ):
@@ -427,19 +534,11 @@ class PyTyping:
     Class representing a typing object, e.g., MoVariant.
     """
 
+    __slots__ = ("name", "typing")
+
     name: Final[str]
     typing: Final[str]
 
-    def __init__(self, name: str, obj: object):
+    def __init__(self, name: str, typing: str):
         self.name = name
-
-        _typing: str
-        if obj.__module__ == "types":
-            _typing = str(obj)
-        # type-var have a weird name, e.g., ~Name
-        elif type(obj) is TypeVar:
-            _typing = f'TypeVar("{name}")'
-        else:
-            _typing = str(obj)
-
-        self.typing = _typing
+        self.typing = typing
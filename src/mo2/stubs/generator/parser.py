@@ -1,10 +1,7 @@
-import inspect
 import logging
-import re
-import types
 from collections import OrderedDict, defaultdict
 from itertools import chain
-from typing import Any, Callable, Iterable, cast
+from typing import Iterable, cast
 
 from .mtypes import (
     Argument,
@@ -19,66 +16,12 @@ from .mtypes import (
     Return,
 )
 from .register import MobaseRegister
+from .signatures import ParsedSignature, cached_parse_signature, parse_docstring
+from .snapshot import ClassInfo, ConstantInfo, FunctionInfo, PropertyInfo
 
 LOGGER = logging.getLogger(__package__)
 
 
-def magic_split(
-    value: str, sep: str = ",", open: str = "(<[", close: str = ")>]"
-) -> list[str]:
-    """
-    Split the value according to the given separator, but keeps together elements
-    within the given separator. Useful to split C++ signature function since type names
-    can contain special characters...
-
-    Examples:
-        - magic_split("a,b,c", sep=",") -> ["a", "b", "c"]
-        - magic_split("a<b,c>,d(e,<k,c>),p) -> ["a<b,c>", "d(e,<k,c>)", "p"]
-
-    Args:
-        value: String to split.
-        sep: Separator to use.
-        open: List of opening characters.
-        close: List of closing characters. Order must match open.
-
-    Returns: The list of split parts from value.
-    """
-    i, j = 0, 0
-    s: list[int] = []
-    r: list[str] = []
-    while i < len(value):
-        j = i + 1
-        while j < len(value):
-            c = value[j]
-
-            # Separator found and the stack is empty:
-            if c == sep and not s:
-                break
-
-            # Check close/open:
-            if c in open:
-                s.append(open.index(c))
-            elif c in close:
-                # The stack might be empty if the separator is also an opening element:
-                if not s and sep in open and j + 1 == len(value):
-                    pass
-                else:
-                    t = s.pop()
-                    if t != close.index(c):
-                        raise ValueError(
-                            "Found closing element {} for opening element {}.".format(
-                                c, open[t]
-                            )
-                        )
-            j += 1
-        r.append(value[i:j])
-        i = j + 1
-
-    assert not s
-
-    return r
-
-
 def parse_python_signature(s: str, name: str) -> tuple[PyType, list[Argument]]:
     """
     Parse a pybind11 python signature.
@@ -90,47 +33,33 @@ def parse_python_signature(s: str, name: str) -> tuple[PyType, list[Argument]]:
     Returns: (RType, Args) where RType is a Type object, and Args is a list of Arg
         objects containing Type.
     """
+    return _convert_signature(cached_parse_signature(s, name))
 
-    m = re.search(rf"{name}\((.*)\)\s*->\s*([^:]+)\s*", s)
-    if not m:
-        raise ValueError(f"invalid signature: {s}")
-
-    args = magic_split(m.group(1).strip(), ",", open="[", close="]")
-    return_type = m.group(2)
 
+def _convert_signature(signature: ParsedSignature) -> tuple[PyType, list[Argument]]:
+    # new arguments are created for each function since they are modified afterwards
     arguments: list[Argument] = []
-    for pa in args:
-        m = re.search(
-            r"(?P<name>[^:]+)\s*:\s*(?P<type>[^=]+)\s*(=\s*(?P<value>[^,]+))?",
-            pa.strip(),
-        )
-        if not m:
-            raise ValueError(f"invalid argument: {pa}, {s}")
-
-        matches = m.groupdict()
-        type_ = matches["type"]
-        if matches["value"] == "None":
-            if "None" not in type_ and "MoVariant" not in type_:
-                type_ = type_ + " | None"
+    for argument in signature.arguments:
+        type_ = PyType(argument.type)
+        if argument.value == "None":
+            # MoVariant already includes None
+            type_ = type_.optional(["MoVariant"])
 
-        arguments.append(Argument(matches["name"], PyType(type_), matches["value"]))
+        arguments.append(Argument(argument.name, type_, argument.value))
 
-    return PyType(return_type), arguments
+    return PyType(signature.return_type), arguments
 
 
 def is_enum(e: object) -> bool:
     """Check if the given class is an enumeration.
 
     Args:
-        e: The class object to check.
+        e: The introspection data of the class to check.
 
     Returns: True if the object is an enumeration (boost::python enumeration, not
         python) False otherwise.
     """
-    # Yet to find a better way...
-    if not isinstance(e, type):
-        return False
-    return hasattr(e, "__entries")
+    return isinstance(e, ClassInfo) and e.entries is not None
 
 
 class Overload:
@@ -155,40 +84,26 @@ def parse_pybind11_function_docstring(name: str, doc: str | None) -> list[Overlo
     Returns:
         A list of overloads for the given function.
     """
-    lines = (doc or "").strip().split("\n")
-
-    signatures: list[str]
-    if len(lines) == 1:
-        signatures = lines
-    else:
-        signatures = []
-        for line in lines:
-            m = re.match(rf"^[0-9]+[.]\s+({name}.*)$", line)
-            if m:
-                signatures.append(m.group(1).strip())
-
-    # We are going to parse the python and C++ signature, and try to merge
-    # them...
+    # the docstrings of inherited methods are parsed once
+    try:
+        signatures = parse_docstring(name, doc)
+    except ValueError as err:
+        raise ValueError(f"invalid signature: {name}, {doc}") from err
+
     overloads: list[Overload] = []
     for signature in signatures:
-        # fix MOBase:: in some places to get proper Python types
-        signature = signature.replace("MOBase::", "mobase.").replace("::", ".")
-
-        try:
-            return_type, arguments = parse_python_signature(signature, name)
-        except ValueError as err:
-            raise ValueError(f"invalid signature: {name}, {doc}") from err
+        return_type, arguments = _convert_signature(signature)
         overloads.append(Overload(return_type=return_type, arguments=arguments))
 
     return overloads
 
 
-def make_functions(e: Callable[..., Any]) -> list[Function]:
-    overloads = parse_pybind11_function_docstring(e.__name__, e.__doc__)
+def make_functions(e: FunctionInfo) -> list[Function]:
+    overloads = parse_pybind11_function_docstring(e.name, e.doc)
 
     return [
         Function(
-            e.__name__,
+            e.name,
             Return(overload.return_type),
             overload.arguments,
             has_overloads=len(overloads) > 1,
@@ -197,12 +112,13 @@ def make_functions(e: Callable[..., Any]) -> list[Function]:
     ]
 
 
-def make_class(e: type, register: MobaseRegister) -> Class:
+def make_class(e: ClassInfo, register: MobaseRegister) -> Class:
     """
     Constructs a Class object from the given python class.
 
     Args:
-        e: The python class (created from boost) to construct an object for.
+        e: The introspection data of the python class (created from boost) to
+            construct an object for.
         class_register:
 
     Returns: A Class object corresponding to the given class.
@@ -211,27 +127,18 @@ def make_class(e: type, register: MobaseRegister) -> Class:
     base_classes_s: list[str] = []
 
     # Kind of ugly, but...:
-    for c in inspect.getmro(e):
-        if c != e and c.__module__ == "mobase":
-            base_classes_s.append(c.__name__)
-        if c.__module__ == "pybind11_builtins":
+    for module, name in e.mro:
+        if module == "mobase":
+            base_classes_s.append(name)
+        if module == "pybind11_builtins":
             break
 
-    first_base = inspect.getmro(e)[1]
-
     # This contains ALL the parent classes, not the direct ones:
     base_classes: list[Class] = [
         register.make_object(name)
         for name in base_classes_s  # type: ignore
     ]
 
-    # retrieve all the attributes that are not in a base class
-    all_attrs = [
-        (n, getattr(e, n))
-        for n in dir(e)
-        if not hasattr(first_base, n) or getattr(first_base, n) is not getattr(e, n)
-    ]
-
     # members to exclude
     EXCLUDED_MEMBERS = [
         "__init_subclass__",
@@ -243,7 +150,23 @@ def make_class(e: type, register: MobaseRegister) -> Class:
         "__index__",
         "__repr__",
     ]
-    all_attrs = [a for a in all_attrs if a[0] not in EXCLUDED_MEMBERS]
+
+    # all the attributes that are not in a base class, classified in a single pass
+    inner_classes: list[ClassInfo] = []
+    raw_methods: list[FunctionInfo] = []
+    raw_attrs: list[tuple[str, PropertyInfo | ConstantInfo]] = []
+    for name, attr in e.attributes:
+        if name in EXCLUDED_MEMBERS:
+            continue
+        if isinstance(attr, ClassInfo):
+            inner_classes.append(attr)
+        elif isinstance(attr, FunctionInfo):
+            # methods without documentation or slot wrappers (e.g. __init__) are
+            # skipped
+            if attr.doc is not None and not attr.wrapper:
+                raw_methods.append(attr)
+        else:
+            raw_attrs.append((name, attr))
 
     # fetch all attributes from the base classes
     base_attrs: dict[str, list[Constant | Property | Method | Class]] = defaultdict(
@@ -257,38 +180,22 @@ def make_class(e: type, register: MobaseRegister) -> Class:
             base_attrs[a.name].append(a)
 
     # retrieve the enumerations and classes
-    inner_classes = [ic[1] for ic in all_attrs if isinstance(ic[1], type)]
-
     pinner_classes: list[Class] = [
-        cast(Class, register.make_object(f"{e.__qualname__}.{ic.__name__}", ic))
+        cast(Class, register.make_object(f"{e.qualname}.{ic.name}", ic))
         for ic in inner_classes
     ]
 
     # find the methods
-    raw_methods = [
-        m[1] for m in all_attrs if callable(m[1]) and m[1] not in inner_classes
-    ]
-    raw_methods = sorted(raw_methods, key=lambda m: str(m.__name__))
-    raw_methods = [m for m in raw_methods if m.__doc__ is not None]
-
-    # remove __init__
-    raw_methods = [
-        m for m in raw_methods if not isinstance(m, types.WrapperDescriptorType)
-    ]
-
     methods: list[Method] = []
-    for method in raw_methods:
-        if method.__doc__ is None:
-            continue
-
+    for method in sorted(raw_methods, key=lambda m: m.name):
         # __eq__ must accept an object in python (and it does with pybind11), so we
         # force the overload
-        if method.__name__ in ["__eq__", "__ne__"]:
+        if method.name in ["__eq__", "__ne__"]:
             overloads = [
                 Overload(
                     return_type=PyType("bool"),
                     arguments=[
-                        Argument("self", PyType(e.__module__ + "." + e.__qualname__)),
+                        Argument("self", PyType(e.module + "." + e.qualname)),
                         Argument("other", PyType("object")),
                     ],
                 )
@@ -296,9 +203,7 @@ def make_class(e: type, register: MobaseRegister) -> Class:
 
         # otherwise we parse the docstring
         else:
-            overloads = parse_pybind11_function_docstring(
-                method.__name__, method.__doc__
-            )
+            overloads = parse_pybind11_function_docstring(method.name, method.doc)
 
         for overload in overloads:
             args = overload.arguments
@@ -323,7 +228,7 @@ def make_class(e: type, register: MobaseRegister) -> Class:
 
             methods.append(
                 Method(
-                    method.__name__,
+                    method.name,
                     Return(overload.return_type),
                     overload.arguments,
                     static=static,
@@ -334,54 +239,41 @@ def make_class(e: type, register: MobaseRegister) -> Class:
     # Retrieve the attributes:
     constants: list[Constant] = []
     properties: list[Property] = []
-    for name, attr in all_attrs:
-        if callable(attr) or isinstance(attr, type):
-            continue
-
+    for name, attr in raw_attrs:
         # Maybe we should check an override here (e.g., different value for a constant):
         if name in base_attrs:
             continue
 
-        if isinstance(attr, property):
-            properties.append(Property(name, PyType("Any"), attr.fset is None))
-        elif not hasattr(attr, "__name__"):
-            constants.append(Constant(name, PyType(type(attr).__name__), attr))
+        if isinstance(attr, PropertyInfo):
+            properties.append(Property(name, PyType("Any"), attr.read_only))
+        else:
+            constants.append(Constant(name, PyType(attr.type), None))
 
     direct_bases: list[Class] = []
-    for c in e.__bases__:
-        if c.__module__ != "pybind11_builtins":
-            b = register.get_object(c.__name__)
+    for module, name in e.bases:
+        if module != "pybind11_builtins":
+            b = register.get_object(name)
             assert isinstance(b, Class)
             direct_bases.append(b)
 
     # Forcing QWidget base for XWidget classes since these do not show up
     # and we use a trick:
-    if e.__name__.endswith("Widget"):
+    if e.name.endswith("Widget"):
         LOGGER.info(
-            "Forcing base {} for class {}.".format(
-                "PyQt6.QtWidgets.QWidget", e.__name__
-            )
+            "Forcing base {} for class {}.".format("PyQt6.QtWidgets.QWidget", e.name)
         )
         direct_bases.append(PyClass("PyQt6.QtWidgets", "QWidget"))
 
     # check if it an enum
-    if is_enum(e):
-        # all pybind11 enums have a .__entries attribute
-        values = cast(dict[str, tuple[int, Any]], e.__entries)  # type: ignore
-
+    if e.entries is not None:
         # drop the __init__
         methods = [m for m in methods if m.name != "__init__"]
 
-        return Enum(
-            e.__module__,
-            e.__name__,
-            OrderedDict((name, value) for name, (value, _) in values.items()),
-            methods=methods,
-        )
+        return Enum(e.module, e.name, OrderedDict(e.entries), methods=methods)
 
     return Class(
-        e.__module__,
-        e.__name__,
+        e.module,
+        e.name,
         direct_bases,
         methods,
         inner_classes=pinner_classes,
@@ -0,0 +1,130 @@
+import importlib
+import json
+import os
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Final
+
+# PyQt6 modules whose names can appear unqualified in pybind11 signatures, in order
+# of precedence (a name found in QtCore is never looked up in QtGui)
+PYQT_MODULES: Final = ("PyQt6.QtCore", "PyQt6.QtGui", "PyQt6.QtWidgets")
+
+_pyqt_index: dict[str, str] | None = None
+
+
+def build_pyqt_index() -> dict[str, str]:
+    """
+    Build the PyQt6 symbol index by importing the PyQt6 modules.
+
+    Returns:
+        A mapping from PyQt6 symbol name to the name of the module containing it.
+    """
+    index: dict[str, str] = {}
+    for module_name in PYQT_MODULES:
+        # import only here since we change the path to find them
+        module = importlib.import_module(module_name)
+        for name in dir(module):
+            index.setdefault(name, module_name)
+    return index
+
+
+def get_pyqt_index() -> dict[str, str]:
+    """
+    Retrieve the PyQt6 symbol index, building it on first use if it has not been
+    loaded from a static table.
+
+    Returns:
+        A mapping from PyQt6 symbol name to the name of the module containing it.
+    """
+    global _pyqt_index
+    if _pyqt_index is None:
+        _pyqt_index = build_pyqt_index()
+    return _pyqt_index
+
+
+def load_pyqt_index(path: os.PathLike[Any]) -> dict[str, str]:
+    """
+    Load the PyQt6 symbol index from a static table, so that PyQt6 does not need
+    to be imported.
+
+    Args:
+        path: Path to a table created by save_pyqt_index().
+
+    Returns:
+        The loaded index, which is also used for all subsequent lookups.
+    """
+    global _pyqt_index
+
+    with open(path, "r") as fp:
+        data = json.load(fp)
+
+    index: dict[str, str] = {}
+    for module_name in PYQT_MODULES:
+        for name in data["modules"].get(module_name, []):
+            index.setdefault(name, module_name)
+
+    _pyqt_index = index
+    return index
+
+
+def set_pyqt_index(index: Mapping[str, str]) -> None:
+    """
+    Use the given PyQt6 symbol index for all subsequent lookups.
+
+    Args:
+        index: A mapping from PyQt6 symbol name to the name of the module containing
+            it, e.g., from get_pyqt_index().
+    """
+    global _pyqt_index
+    _pyqt_index = dict(index)
+
+
+def save_pyqt_index(path: os.PathLike[Any]) -> None:
+    """
+    Save the PyQt6 symbol index to a static table that can be loaded with
+    load_pyqt_index().
+
+    Args:
+        path: Path of the table to write.
+    """
+    from PyQt6.QtCore import PYQT_VERSION_STR
+
+    modules: dict[str, list[str]] = {name: [] for name in PYQT_MODULES}
+    for name, module_name in get_pyqt_index().items():
+        modules[module_name].append(name)
+
+    with open(path, "w") as fp:
+        json.dump({"pyqt": PYQT_VERSION_STR, "modules": modules}, fp, indent=1)
+
+
+def qualify_pyqt_name(name: str) -> str:
+    """
+    Qualify the given name if it is a PyQt6 symbol.
+
+    Args:
+        name: The name to qualify, e.g., QWidget.
+
+    Returns:
+        The qualified name (e.g., PyQt6.QtWidgets.QWidget) or the name itself if
+        it is not a PyQt6 symbol.
+    """
+    module_name = get_pyqt_index().get(name)
+    if module_name is None:
+        return name
+    return f"{module_name}.{name}"
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser("Create a static table of PyQt6 symbols")
+    parser.add_argument(
+        "output",
+        metavar="OUTPUT",
+        type=Path,
+        help="path of the table to create",
+    )
+
+    args = parser.parse_args()
+
+    save_pyqt_index(args.output)
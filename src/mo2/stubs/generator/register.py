@@ -2,9 +2,159 @@
 
 from __future__ import annotations
 
-from collections import OrderedDict
+from collections import OrderedDict, defaultdict
+from collections.abc import Iterable, Iterator, Mapping
+from itertools import chain
 
-from .mtypes import Class, Constant, Function, PyType, PyTyping
+from .mtypes import Class, Constant, Function, Method, PyType, PyTyping
+from .snapshot import ClassInfo, FunctionInfo, ObjectInfo, TypingInfo
+
+
+def class_dependencies(e: ClassInfo) -> Iterator[str]:
+    """
+    Yield the names of the objects that must be built before the given class, i.e.,
+    its bases from mobase, including the bases of bases, and the bases of its inner
+    classes. Names may be repeated.
+    """
+    for module, name in e.mro:
+        if module == "mobase":
+            yield name
+        if module == "pybind11_builtins":
+            break
+
+    for module, name in e.bases:
+        if module != "pybind11_builtins":
+            yield name
+
+    for _, attr in e.attributes:
+        if isinstance(attr, ClassInfo):
+            yield from class_dependencies(attr)
+
+
+class ClassGraph:
+    """
+    Inheritance graph of the classes, with the ancestors and the depth of each class
+    computed once, and an index of the methods of each class and of its ancestors.
+
+    The graph must be invalidated when the bases of a class are modified (see
+    invalidate()) or when the methods of a class are modified (see
+    invalidate_methods()).
+    """
+
+    def __init__(self) -> None:
+        self._ancestors: dict[Class, tuple[Class, ...]] = {}
+        self._depths: dict[Class, int] = {}
+        self._methods: dict[Class, dict[str, list[Method]]] = {}
+        self._inherited_methods: dict[Class, dict[str, list[Method]]] = {}
+
+        # class -> classes whose inherited methods were built from its methods
+        self._dependents: dict[Class, list[Class]] = defaultdict(list)
+
+    def invalidate(self) -> None:
+        """
+        Invalidate everything computed so far.
+        """
+        self._ancestors.clear()
+        self._depths.clear()
+        self._methods.clear()
+        self._inherited_methods.clear()
+        self._dependents.clear()
+
+    def invalidate_methods(self, cls: Class) -> None:
+        """
+        Invalidate the indices built from the methods of the given class, i.e., its
+        own index and the index of inherited methods of the classes deriving from it.
+        """
+        self._methods.pop(cls, None)
+
+        stack = [cls]
+        while stack:
+            for dependent in self._dependents.pop(stack.pop(), []):
+                if self._inherited_methods.pop(dependent, None) is not None:
+                    stack.append(dependent)
+
+    def ancestors(self, cls: Class) -> tuple[Class, ...]:
+        """
+        Args:
+            cls: The class to retrieve the ancestors of.
+
+        Returns:
+            All the bases of the given class, including bases of bases and so on,
+            without duplicates, in depth-first order of the bases.
+        """
+        ancestors = self._ancestors.get(cls)
+        if ancestors is None:
+            ancestors = tuple(
+                dict.fromkeys(
+                    chain.from_iterable((b, *self.ancestors(b)) for b in cls.bases)
+                )
+            )
+            self._ancestors[cls] = ancestors
+        return ancestors
+
+    def depth(self, cls: Class) -> int:
+        """
+        Args:
+            cls: The class to retrieve the depth of.
+
+        Returns:
+            The length of the longest chain of bases from the given class, i.e., 0
+            for a class without bases. Sorting classes by depth gives a topological
+            order, with bases before derived classes.
+        """
+        depth = self._depths.get(cls)
+        if depth is None:
+            depth = 1 + max(map(self.depth, cls.bases), default=-1)
+            self._depths[cls] = depth
+        return depth
+
+    def methods(self, cls: Class) -> Mapping[str, list[Method]]:
+        """
+        Args:
+            cls: The class to retrieve the methods of.
+
+        Returns:
+            A mapping from name to methods with this name of the given class, in the
+            order of the class.
+        """
+        if cls not in self._methods:
+            index: dict[str, list[Method]] = {}
+            for method in cls.methods:
+                index.setdefault(method.name, []).append(method)
+            self._methods[cls] = index
+        return self._methods[cls]
+
+    def inherited_methods(self, cls: Class) -> Mapping[str, list[Method]]:
+        """
+        Args:
+            cls: The class to retrieve the inherited methods of.
+
+        Returns:
+            A mapping from name to methods with this name of the ancestors of the
+            given class, in the order of ancestors(), and then in the order of each
+            ancestor.
+        """
+        if cls in self._inherited_methods:
+            return self._inherited_methods[cls]
+
+        index: dict[str, list[Method]]
+        if len(cls.bases) == 1:
+            # built from the index of the single base, which comes first
+            base = cls.bases[0]
+            inherited = self.inherited_methods(base)
+            index = dict(inherited)
+            for name, methods in self.methods(base).items():
+                index[name] = methods + inherited.get(name, [])
+            self._dependents[base].append(cls)
+        else:
+            index = {}
+            for ancestor in self.ancestors(cls):
+                for name, methods in self.methods(ancestor).items():
+                    index.setdefault(name, []).extend(methods)
+                self._dependents[ancestor].append(cls)
+
+        self._inherited_methods[cls] = index
+        return index
 
 
 class MobaseRegister:
@@ -13,47 +163,149 @@ class MobaseRegister:
     """
 
     objects: dict[str, Class | Constant | list[Function] | PyTyping]
+    class_graph: ClassGraph
 
     def __init__(self) -> None:
-        self.raw_objects: dict[str, object] = OrderedDict()
+        self.raw_objects: dict[str, ObjectInfo] = OrderedDict()
         self.objects = {}
+        self.class_graph = ClassGraph()
 
-    def add_object(self, n: str, o: object, /) -> None:
+    def add_object(self, n: str, o: ObjectInfo, /) -> None:
         self.raw_objects[n] = o
 
     def make_object(
-        self, name: str, e: object | None = None
+        self, name: str, e: ObjectInfo | None = None
     ) -> Class | list[Function] | Constant | PyTyping:
         """
         Construct a Function, Class, Constant or Enum for the given object.
 
         Args:
             name: The name of the object to inspect.
-            e: The object to inspect, or None to fetch it from the underlying list.
+            e: The introspection data of the object, or None to fetch it from the
+                underlying list.
 
         Returns:
             A Class object for the given type, or a list of function overloads.
         """
         from .parser import make_class, make_functions
 
+        if name in self.objects:
+            # the introspection data may have been released
+            return self.objects[name]
+
         if e is None:
             e = self.raw_objects[name]
 
         if name not in self.raw_objects:
             self.raw_objects[name] = e
 
-        if name not in self.objects:
-            if isinstance(e, type):
-                self.objects[name] = make_class(e, self)
-            elif callable(e):
-                self.objects[name] = make_functions(e)
-            elif type(e).__module__ == "types" or type(e).__module__ == "typing":
-                self.objects[name] = PyTyping(name, e)
-            else:
-                self.objects[name] = Constant(name, type=PyType(type(e)), value=e)
+        if isinstance(e, ClassInfo):
+            self.objects[name] = make_class(e, self)
+        elif isinstance(e, FunctionInfo):
+            self.objects[name] = make_functions(e)
+        elif isinstance(e, TypingInfo):
+            self.objects[name] = PyTyping(name, e.typing)
+        else:
+            self.objects[name] = Constant(name, type=PyType(e.type), value=None)
 
         return self.objects[name]
 
+    def dependency_waves(self, names: Iterable[str]) -> list[list[str]]:
+        """
+        Schedule the construction of the given objects and of the objects they depend
+        on (see class_dependencies()) that are not built yet, in waves: the objects
+        of a wave only depend on objects of previous waves, so they can be built in
+        any order.
+
+        Args:
+            names: Names of the objects to build, added with add_object().
+
+        Returns:
+            The names of the objects to build, by wave, ordered within each wave as
+            the given names, followed by the dependencies in the order they are
+            found.
+
+        Raises:
+            ValueError: If a base of a class is not in the register, or if classes
+                depend on each other.
+        """
+        # dependencies of each object to build, found breadth-first
+        order = [n for n in dict.fromkeys(names) if n not in self.objects]
+        dependencies: dict[str, list[str]] = {}
+        for name in order:
+            if name in dependencies:
+                continue
+
+            e = self.raw_objects.get(name)
+            if e is None:
+                raise ValueError(f"unknown object {name}")
+
+            dependencies[name] = []
+            if isinstance(e, ClassInfo):
+                for dependency in dict.fromkeys(class_dependencies(e)):
+                    if dependency in self.objects:
+                        continue
+                    if dependency not in self.raw_objects:
+                        raise ValueError(
+                            f"missing base {dependency} of class {e.qualname}"
+                        )
+                    dependencies[name].append(dependency)
+                    order.append(dependency)
+
+        # Kahn's algorithm, one wave at a time
+        index = {name: i for i, name in enumerate(dependencies)}
+        counts = {name: len(d) for name, d in dependencies.items()}
+        dependents: dict[str, list[str]] = defaultdict(list)
+        for name, d in dependencies.items():
+            for dependency in d:
+                dependents[dependency].append(name)
+
+        waves: list[list[str]] = []
+        wave = [name for name, count in counts.items() if count == 0]
+        while wave:
+            waves.append(wave)
+            ready: list[str] = []
+            for name in wave:
+                for dependent in dependents[name]:
+                    counts[dependent] -= 1
+                    if counts[dependent] == 0:
+                        ready.append(dependent)
+            wave = sorted(ready, key=index.__getitem__)
+
+        if sum(map(len, waves)) != len(dependencies):
+            cyclic = [name for name, count in counts.items() if count > 0]
+            raise ValueError(
+                "cyclic bases between the classes {}".format(", ".join(cyclic))
+            )
+
+        return waves
+
+    def make_objects(self, names: Iterable[str]) -> None:
+        """
+        Construct the given objects and the objects they depend on, wave by wave
+        (see dependency_waves()), so that missing bases and cycles are reported
+        before anything is built.
+
+        Args:
+            names: Names of the objects to build, added with add_object().
+
+        Raises:
+            ValueError: If a base of a class is not in the register, or if classes
+                depend on each other.
+        """
+        for wave in self.dependency_waves(names):
+            for name in wave:
+                self.make_object(name)
+
+    def release_raw_objects(self) -> None:
+        """
+        Drop the introspection data of the objects already built, which is not needed
+        anymore, e.g., the docstrings of the overloads. The introspection data of the
+        objects not built yet is kept.
+        """
+        for name in self.objects.keys() & self.raw_objects.keys():
+            del self.raw_objects[name]
+
     def get_object(self, name: str) -> Class | Constant | list[Function] | PyTyping:
         """
         Retrieve the object if the given name. Fails if no object with this
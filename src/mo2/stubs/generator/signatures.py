@@ -0,0 +1,277 @@
+import hashlib
+import re
+from collections.abc import Mapping
+from typing import Final, NamedTuple
+
+from .timing import increment
+
+# structural tokens of a signature - everything between them (names, numbers, ...)
+# is kept as-is; strings are matched as a whole so that their content is ignored, and
+# lone quotes are matched to detect unterminated strings
+_TOKENS: Final = re.compile(
+    r"->|[()\[\]<>{},:=]|'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"|['\"]"
+)
+
+_BRACKETS: Final = {"(": ")", "[": "]", "<": ">", "{": "}"}
+_CLOSING: Final = frozenset(_BRACKETS.values())
+_QUOTES: Final = frozenset("'\"")
+
+
+class ParsedArgument(NamedTuple):
+    """
+    Argument of a parsed signature, with the type and default value as written in
+    the signature.
+    """
+
+    name: str
+    type: str
+    value: str | None
+
+
+class ParsedSignature(NamedTuple):
+    """
+    A parsed pybind11 signature.
+    """
+
+    arguments: tuple[ParsedArgument, ...]
+    return_type: str
+
+
+def parse_signature(signature: str, name: str) -> ParsedSignature:
+    """
+    Parse a pybind11 python signature, e.g., "name(a: int, b: str = '') -> None", in
+    a single pass over its tokens.
+
+    Args:
+        signature: The signature to parse.
+        name: Name of the function.
+
+    Returns:
+        The parsed signature.
+
+    Raises:
+        ValueError: If the signature is not valid.
+    """
+    start = signature.find(name + "(")
+    if start < 0:
+        raise ValueError(f"invalid signature: {signature}")
+
+    arguments: list[ParsedArgument] = []
+
+    # closing brackets expected, the parenthesis of the arguments is at the bottom
+    stack: list[str] = []
+
+    # start of the current argument and position of its top-level ":" and "="
+    arg_start = start + len(name) + 1
+    colon, equal = -1, -1
+
+    # end of the arguments and start of the return type, when found
+    args_end, ret_start = -1, -1
+
+    for m in _TOKENS.finditer(signature, arg_start - 1):
+        token = m.group()
+        pos = m.start()
+
+        if ret_start >= 0:
+            if token in _BRACKETS:
+                stack.append(_BRACKETS[token])
+            elif token in _CLOSING:
+                if not stack or stack.pop() != token:
+                    raise ValueError(f"invalid signature: {signature}")
+            elif token == ":" and not stack:
+                return ParsedSignature(
+                    tuple(arguments), _return_type(signature, ret_start, pos)
+                )
+            elif token in _QUOTES:
+                raise ValueError(f"invalid signature: {signature}")
+
+        elif args_end >= 0:
+            # only an arrow can follow the arguments
+            if token != "->" or signature[args_end:pos].strip():
+                raise ValueError(f"invalid signature: {signature}")
+            ret_start = m.end()
+
+        elif token in _BRACKETS:
+            stack.append(_BRACKETS[token])
+
+        elif token in _CLOSING:
+            if stack.pop() != token:
+                raise ValueError(f"invalid signature: {signature}")
+
+            # end of the arguments
+            if not stack:
+                if arg_start != pos and signature[arg_start:pos].strip():
+                    arguments.append(
+                        _make_argument(signature, arg_start, colon, equal, pos)
+                    )
+                args_end = m.end()
+
+        elif len(stack) == 1:
+            if token == ",":
+                arguments.append(
+                    _make_argument(signature, arg_start, colon, equal, pos)
+                )
+                arg_start = pos + 1
+                colon, equal = -1, -1
+            elif token == ":":
+                if colon < 0:
+                    colon = pos
+            elif token == "=":
+                if colon >= 0 and equal < 0:
+                    equal = pos
+            elif token in _QUOTES:
+                raise ValueError(f"invalid signature: {signature}")
+
+        elif token in _QUOTES:
+            raise ValueError(f"invalid signature: {signature}")
+
+    if ret_start < 0 or stack:
+        raise ValueError(f"invalid signature: {signature}")
+
+    return ParsedSignature(
+        tuple(arguments), _return_type(signature, ret_start, len(signature))
+    )
+
+
+def _return_type(signature: str, start: int, end: int) -> str:
+    return_type = signature[start:end].strip()
+    if not return_type:
+        raise ValueError(f"invalid signature: {signature}")
+    return return_type
+
+
+def _make_argument(
+    signature: str, start: int, colon: int, equal: int, end: int
+) -> ParsedArgument:
+    """
+    Create the argument in signature[start:end], e.g., "name: type = value", given
+    the position of the top-level ":" and "=" (or -1).
+    """
+    name = signature[start:colon].strip() if colon >= 0 else ""
+    type_ = signature[colon + 1 : equal if equal >= 0 else end].strip()
+    value = signature[equal + 1 : end].strip() if equal >= 0 else None
+
+    if not name or not type_ or value == "":
+        raise ValueError(f"invalid argument: {signature[start:end]}, {signature}")
+
+    return ParsedArgument(name, type_, value)
+
+
+# signatures parsed by cached_parse_signature(), by name and signature, parsed
+# signatures are immutable so they can be shared by all the modules and versions built
+# in the same process
+_parsed_signatures: dict[tuple[str, str], ParsedSignature] = {}
+
+
+def cached_parse_signature(signature: str, name: str) -> ParsedSignature:
+    """
+    Parse a pybind11 python signature, see parse_signature(), reusing the result of
+    previous calls with the same signature. Invalid signatures are not cached.
+    """
+    key = (name, signature)
+    parsed = _parsed_signatures.get(key)
+    if parsed is not None:
+        increment("signatures.hits")
+        return parsed
+
+    increment("signatures.misses")
+    parsed = _parsed_signatures[key] = parse_signature(signature, name)
+    return parsed
+
+
+def overload_signatures(name: str, doc: str | None) -> list[str]:
+    """
+    Extract the signatures from the docstring of a pybind11 function, i.e., the
+    docstring itself for function without overloads, or the numbered lines for
+    function with overloads.
+
+    C++ names (MOBase::X, A::B) are normalized to Python ones (mobase.X, A.B).
+
+    Args:
+        name: Name of the function.
+        doc: The docstring of the function generated by pybind11.
+
+    Returns:
+        The list of signatures in the docstring, one per overload.
+    """
+    lines = (doc or "").strip().split("\n")
+
+    signatures: list[str]
+    if len(lines) == 1:
+        signatures = lines
+    else:
+        # lines of the form "1. name(...) -> ..."
+        signatures = []
+        for line in lines:
+            dot = line.find(".")
+            if dot <= 0 or not (line[:dot].isascii() and line[:dot].isdecimal()):
+                continue
+            signature = line[dot + 1 :]
+            if not signature[:1].isspace():
+                continue
+            signature = signature.lstrip()
+            if signature.startswith(name):
+                signatures.append(signature.strip())
+
+    # fix MOBase:: in some places to get proper Python types
+    return [
+        signature.replace("MOBase::", "mobase.").replace("::", ".")
+        for signature in signatures
+    ]
+
+
+# overloads parsed by parse_docstring(), by name and hash of the docstring, shared by
+# all the classes inheriting a method and by all the versions built in the process
+_parsed_docstrings: dict[tuple[str, str], tuple[ParsedSignature, ...]] = {}
+
+
+def _docstring_key(name: str, doc: str | None) -> tuple[str, str]:
+    # a digest instead of the docstring itself so that the keys can be stored
+    return name, hashlib.blake2b((doc or "").encode(), digest_size=16).hexdigest()
+
+
+def parse_docstring(name: str, doc: str | None) -> tuple[ParsedSignature, ...]:
+    """
+    Parse the signatures of the overloads in the docstring of a pybind11 function
+    (see overload_signatures() and parse_signature()), reusing the result of previous
+    calls with the same name and docstring. Invalid docstrings are not cached.
+
+    Raises:
+        ValueError: If one of the signatures is not valid.
+    """
+    key = _docstring_key(name, doc)
+    parsed = _parsed_docstrings.get(key)
+    if parsed is not None:
+        increment("docstrings.hits")
+        return parsed
+
+    increment("docstrings.misses")
+    parsed = _parsed_docstrings[key] = tuple(
+        cached_parse_signature(signature, name)
+        for signature in overload_signatures(name, doc)
+    )
+    return parsed
+
+
+def parsed_docstrings() -> dict[tuple[str, str], tuple[ParsedSignature, ...]]:
+    """
+    Retrieve the docstrings parsed by parse_docstring(), e.g., to store them.
+
+    Returns:
+        A mapping from name and hash of the docstring to parsed overloads.
+    """
+    return _parsed_docstrings
+
+
+def add_parsed_docstrings(
+    docstrings: Mapping[tuple[str, str], tuple[ParsedSignature, ...]],
+) -> None:
+    """
+    Add docstrings parsed by parse_docstring(), e.g., in a previous run, to the ones
+    reused by parse_docstring().
+
+    Args:
+        docstrings: A mapping from name and hash of the docstring to parsed overloads,
+            from parsed_docstrings().
+    """
+    _parsed_docstrings.update(docstrings)
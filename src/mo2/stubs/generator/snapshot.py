@@ -0,0 +1,299 @@
+from __future__ import annotations
+
+import gzip
+import inspect
+import json
+import os
+import time
+import types
+from collections.abc import Callable, Iterable, Mapping
+from pathlib import Path
+from typing import IO, Any, Final, NamedTuple, TypeVar, cast
+
+from .timing import record_time
+
+# version of the snapshot format
+SNAPSHOT_VERSION: Final = 1
+
+
+class FunctionInfo(NamedTuple):
+    """
+    Introspection data of a function or a method.
+    """
+
+    name: str
+    doc: str | None
+    module: str | None = None
+
+    # True for slot wrappers (e.g., __init__ of classes without constructor)
+    wrapper: bool = False
+
+
+class PropertyInfo(NamedTuple):
+    """
+    Introspection data of a property.
+    """
+
+    read_only: bool
+
+
+class ConstantInfo(NamedTuple):
+    """
+    Introspection data of a constant (the value itself is not kept).
+    """
+
+    type: str
+    module: str | None = None
+
+
+class TypingInfo(NamedTuple):
+    """
+    Introspection data of a typing object, e.g., a TypeVar or a type alias.
+    """
+
+    typing: str
+    module: str | None = None
+
+
+class ClassInfo(NamedTuple):
+    """
+    Introspection data of a class.
+    """
+
+    name: str
+    qualname: str
+    module: str
+
+    # (module, name) of the classes in the MRO (excluding the class itself)
+    mro: tuple[tuple[str, str], ...]
+
+    # (module, name) of the direct bases of the class
+    bases: tuple[tuple[str, str], ...]
+
+    # attributes that are not inherited from the first base, in dir() order
+    attributes: tuple[tuple[str, AttributeInfo], ...]
+
+    # pybind11 enumeration entries (name, value), or None if not an enumeration
+    entries: tuple[tuple[str, int], ...] | None = None
+
+
+class ModuleInfo(NamedTuple):
+    """
+    Introspection data of a module.
+    """
+
+    name: str
+    objects: tuple[tuple[str, ObjectInfo], ...]
+
+
+type AttributeInfo = ClassInfo | FunctionInfo | PropertyInfo | ConstantInfo
+type ObjectInfo = ClassInfo | FunctionInfo | ConstantInfo | TypingInfo
+
+
+def capture_function(e: Callable[..., Any]) -> FunctionInfo:
+    """
+    Capture the introspection data of the given function.
+    """
+    return FunctionInfo(
+        e.__name__,
+        e.__doc__,
+        getattr(e, "__module__", None),
+        isinstance(e, types.WrapperDescriptorType),
+    )
+
+
+def capture_class(e: type) -> ClassInfo:
+    """
+    Capture the introspection data of the given class.
+    """
+    start = time.perf_counter()
+
+    mro = e.__mro__
+    first_base = mro[1]
+
+    # owner of each attribute, i.e., the first class of the MRO defining it, found with
+    # a single pass over the classes of the MRO
+    owners: dict[str, type] = {}
+    for c in mro:
+        for n in vars(c):
+            owners.setdefault(n, c)
+
+    # retrieve all the attributes that are not in a base class, in dir() order,
+    # attributes owned by a class in the MRO of the first base are inherited from it
+    first_base_mro = set(first_base.__mro__)
+    attributes: list[tuple[str, AttributeInfo]] = []
+    for n in sorted(owners):
+        if owners[n] in first_base_mro:
+            continue
+
+        attr = getattr(e, n)
+        if hasattr(first_base, n) and getattr(first_base, n) is attr:
+            continue
+
+        if isinstance(attr, type):
+            attributes.append((n, capture_class(attr)))
+        elif callable(attr):
+            attributes.append((n, capture_function(attr)))
+        elif isinstance(attr, property):
+            attributes.append((n, PropertyInfo(attr.fset is None)))
+        elif not hasattr(attr, "__name__"):
+            attributes.append((n, ConstantInfo(type(attr).__name__)))
+
+    # all pybind11 enums have a .__entries attribute
+    entries: tuple[tuple[str, int], ...] | None = None
+    if hasattr(e, "__entries"):
+        values = cast(dict[str, tuple[Any, Any]], getattr(e, "__entries"))
+        entries = tuple((name, int(value)) for name, (value, _) in values.items())
+
+    info = ClassInfo(
+        e.__name__,
+        e.__qualname__,
+        e.__module__,
+        tuple((c.__module__, c.__name__) for c in mro[1:]),
+        tuple((c.__module__, c.__name__) for c in e.__bases__),
+        tuple(attributes),
+        entries,
+    )
+
+    # includes the time spent on inner classes
+    record_time(
+        "introspection", f"{e.__module__}.{e.__qualname__}", time.perf_counter() - start
+    )
+
+    return info
+
+
+def capture_object(name: str, e: object) -> ObjectInfo:
+    """
+    Capture the introspection data of the given module-level object.
+    """
+    if isinstance(e, type):
+        return capture_class(e)
+
+    if callable(e):
+        return capture_function(e)
+
+    module: str | None = getattr(e, "__module__", None)
+    if type(e).__module__ == "types" or type(e).__module__ == "typing":
+        typing: str
+        # type-var have a weird name, e.g., ~Name
+        if module != "types" and type(e) is TypeVar:
+            typing = f'TypeVar("{name}")'
+        else:
+            typing = str(e)
+        return TypingInfo(typing, module)
+
+    return ConstantInfo(type(e).__name__, module)
+
+
+def capture_module(module: types.ModuleType) -> ModuleInfo:
+    """
+    Capture the introspection data of the given module, excluding submodules and
+    special attributes.
+    """
+    objects: list[tuple[str, ObjectInfo]] = []
+    for name in dir(module):
+        if name.startswith("__"):
+            continue
+
+        obj = getattr(module, name)
+        if inspect.ismodule(obj):
+            continue
+
+        objects.append((name, capture_object(name, obj)))
+
+    return ModuleInfo(module.__name__, tuple(objects))
+
+
+_KINDS: Final[Mapping[str, type[NamedTuple]]] = {
+    "class": ClassInfo,
+    "function": FunctionInfo,
+    "property": PropertyInfo,
+    "constant": ConstantInfo,
+    "typing": TypingInfo,
+}
+_KIND_NAMES: Final = {cls: kind for kind, cls in _KINDS.items()}
+
+
+def dump_info(info: AttributeInfo | ObjectInfo) -> list[Any]:
+    """
+    Convert the given introspection data to a JSON-serializable value.
+    """
+    if isinstance(info, ClassInfo):
+        return [
+            "class",
+            info.name,
+            info.qualname,
+            info.module,
+            info.mro,
+            info.bases,
+            [[n, dump_info(a)] for n, a in info.attributes],
+            info.entries,
+        ]
+    return [_KIND_NAMES[type(info)], *info]
+
+
+def _load_info(data: list[Any]) -> Any:
+    kind, *values = data
+    if kind == "class":
+        name, qualname, module, mro, bases, attributes, entries = values
+        return ClassInfo(
+            name,
+            qualname,
+            module,
+            tuple((m, n) for m, n in mro),
+            tuple((m, n) for m, n in bases),
+            tuple((n, _load_info(a)) for n, a in attributes),
+            None if entries is None else tuple((n, v) for n, v in entries),
+        )
+    return _KINDS[kind](*values)
+
+
+def _open(path: Path, mode: str) -> IO[str]:
+    if path.suffix == ".gz":
+        return cast(IO[str], gzip.open(path, mode + "t", encoding="utf-8"))
+    return open(path, mode, encoding="utf-8")
+
+
+def save_snapshot(path: os.PathLike[Any], modules: Iterable[ModuleInfo]) -> None:
+    """
+    Save the introspection data of the given modules to a snapshot file.
+
+    Args:
+        path: Path of the snapshot, compressed if it ends with .gz.
+        modules: Introspection data of the modules to save.
+    """
+    data = {
+        "version": SNAPSHOT_VERSION,
+        "modules": {
+            module.name: [[n, dump_info(o)] for n, o in module.objects]
+            for module in modules
+        },
+    }
+    with _open(Path(path), "w") as fp:
+        json.dump(data, fp, separators=(",", ":"))
+
+
+def load_snapshot(path: os.PathLike[Any]) -> dict[str, ModuleInfo]:
+    """
+    Load the introspection data from a snapshot file.
+
+    Args:
+        path: Path of the snapshot created by save_snapshot().
+
+    Returns:
+        A mapping from module name to introspection data.
+    """
+    with _open(Path(path), "r") as fp:
+        data = json.load(fp)
+
+    if data["version"] != SNAPSHOT_VERSION:
+        raise ValueError(
+            f"unsupported snapshot version {data['version']} for {path}, "
+            f"expected {SNAPSHOT_VERSION}"
+        )
+
+    return {
+        name: ModuleInfo(name, tuple((n, _load_info(o)) for n, o in objects))
+        for name, objects in data["modules"].items()
+    }
@@ -0,0 +1,255 @@
+import cProfile
+import json
+import logging
+import os
+import re
+import time
+from collections import Counter, defaultdict
+from collections.abc import Generator, Mapping
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, NamedTuple
+
+LOGGER = logging.getLogger(__package__)
+
+
+class StepTime(NamedTuple):
+    """
+    Wall and CPU times of a step timed with timed().
+    """
+
+    step: str
+    wall: float
+
+    # CPU time of the thread running the step, i.e., excluding other threads and
+    # processes (e.g., ruff or the workers of -j)
+    cpu: float
+
+
+# times of the steps timed with timed(), in order
+_steps: list[StepTime] = []
+
+# wall times of fine-grained steps, by category and name
+_times: defaultdict[str, dict[str, float]] = defaultdict(dict)
+
+# counters of the hot paths, see increment()
+_counters: Counter[str] = Counter()
+
+# profiles of the steps, by step, when enabled with enable_profiling()
+_profiles: dict[str, cProfile.Profile] | None = None
+
+# wall and CPU times and profiles of the steps timed with timed_part() since the last
+# call to record_parts(), by step
+_parts: dict[str, list[float]] = {}
+_part_profiles: dict[str, cProfile.Profile] = {}
+
+
+@contextmanager
+def timed(step: str, profile: bool = True) -> Generator[None, None, None]:
+    """
+    Log the wall time of the enclosed step, at the INFO level, and record its wall
+    and CPU times (see write_report()).
+
+    If profiling is enabled (see enable_profiling()), the step is also profiled with
+    cProfile, unless another step is already being profiled.
+
+    Args:
+        step: Description of the step, e.g., "Loading mobase".
+        profile: False to not profile the step, e.g., to profile its own steps.
+    """
+    profiler: cProfile.Profile | None = None
+    if _profiles is not None and profile:
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # only one profiler can be active at a time
+            profiler = None
+
+    start, start_cpu = time.perf_counter(), time.thread_time()
+    try:
+        yield
+    finally:
+        wall, cpu = time.perf_counter() - start, time.thread_time() - start_cpu
+        if profiler is not None and _profiles is not None:
+            profiler.disable()
+            _profiles[step] = profiler
+
+        _steps.append(StepTime(step, wall, cpu))
+        LOGGER.info("{} took {:.3f}s.".format(step, wall))
+
+
+@contextmanager
+def timed_part(step: str) -> Generator[None, None, None]:
+    """
+    Add the wall and CPU times of the enclosed code to the given step, for steps done
+    in many parts interleaved with other steps, e.g., cleaning each class of a module
+    between building and patching it. The step is recorded by record_parts().
+
+    If profiling is enabled (see enable_profiling()), the parts of the step are
+    profiled together, unless another step is already being profiled.
+
+    Args:
+        step: Description of the step, e.g., "Cleaning the classes".
+    """
+    profiler: cProfile.Profile | None = None
+    if _profiles is not None:
+        profiler = _part_profiles.get(step) or cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            profiler = None
+
+    start, start_cpu = time.perf_counter(), time.thread_time()
+    try:
+        yield
+    finally:
+        wall, cpu = time.perf_counter() - start, time.thread_time() - start_cpu
+        if profiler is not None:
+            profiler.disable()
+            _part_profiles[step] = profiler
+
+        times = _parts.setdefault(step, [0.0, 0.0])
+        times[0] += wall
+        times[1] += cpu
+
+
+def record_parts(suffix: str = "") -> None:
+    """
+    Log the wall time of the steps timed with timed_part() since the last call, at
+    the INFO level, and record their wall and CPU times (see write_report()).
+
+    Args:
+        suffix: Suffix of the names of the steps, e.g., " of mobase".
+    """
+    for step, (wall, cpu) in _parts.items():
+        if _profiles is not None and step in _part_profiles:
+            _profiles[step + suffix] = _part_profiles[step]
+
+        _steps.append(StepTime(step + suffix, wall, cpu))
+        LOGGER.info("{}{} took {:.3f}s.".format(step, suffix, wall))
+
+    _parts.clear()
+    _part_profiles.clear()
+
+
+def record_time(category: str, name: str, seconds: float) -> None:
+    """
+    Record the wall time of a fine-grained step, e.g., the introspection of a class.
+
+    Args:
+        category: Category of the step, e.g., "introspection".
+        name: Name of the step in its category, e.g., the name of the class.
+        seconds: Wall time of the step, in seconds.
+    """
+    _times[category][name] = seconds
+
+
+def recorded_times(category: str) -> Mapping[str, float]:
+    """
+    Retrieve the wall times recorded with record_time() for the given category.
+    """
+    return _times[category]
+
+
+def log_slowest(category: str, count: int = 5) -> None:
+    """
+    Log the slowest steps of the given category, at the INFO level.
+    """
+    times = _times[category]
+    slowest = sorted(times, key=times.__getitem__, reverse=True)[:count]
+    LOGGER.info(
+        "Slowest {} steps (out of {}): {}.".format(
+            category,
+            len(times),
+            ", ".join("{} ({:.2f}ms)".format(n, times[n] * 1e3) for n in slowest),
+        )
+    )
+
+
+def increment(counter: str, n: int = 1) -> None:
+    """
+    Increment a counter of a hot path, e.g., "PyType.misses".
+
+    Counters named X.hits and X.misses are reported together as the hit rate of X.
+    """
+    _counters[counter] += n
+
+
+def counters() -> Mapping[str, int]:
+    """
+    Retrieve the counters incremented with increment().
+    """
+    return _counters
+
+
+def add_counters(counts: Mapping[str, int]) -> None:
+    """
+    Add the given counts to the counters, e.g., the counts of a worker process.
+    """
+    _counters.update(counts)
+
+
+def hit_rates() -> dict[str, float]:
+    """
+    Compute the hit rates of the counters named X.hits and X.misses, by X.
+    """
+    rates: dict[str, float] = {}
+    for name in sorted(_counters):
+        prefix, _, kind = name.rpartition(".")
+        if kind in ("hits", "misses") and prefix not in rates:
+            hits = _counters.get(prefix + ".hits", 0)
+            total = hits + _counters.get(prefix + ".misses", 0)
+            rates[prefix] = hits / total if total else 0.0
+    return rates
+
+
+def write_report(path: os.PathLike[Any]) -> None:
+    """
+    Write the recorded times and the counters to a JSON file.
+
+    Args:
+        path: Path of the report.
+    """
+    report = {
+        "steps": [step._asdict() for step in _steps],
+        "counters": dict(sorted(_counters.items())),
+        "hit_rates": hit_rates(),
+        "times": {category: dict(times) for category, times in _times.items()},
+    }
+    with open(path, "w") as fp:
+        json.dump(report, fp, indent=2)
+
+
+def enable_profiling() -> None:
+    """
+    Profile the steps timed with timed() from now on, see dump_profiles().
+    """
+    global _profiles
+    if _profiles is None:
+        _profiles = {}
+
+
+def dump_profiles(folder: os.PathLike[Any], count: int = 5) -> list[Path]:
+    """
+    Dump the cProfile statistics of the slowest profiled steps, in .prof files that
+    can be read with pstats or snakeviz.
+
+    Args:
+        folder: Directory of the files, created if it does not exist.
+        count: Number of steps to dump.
+
+    Returns:
+        The paths of the files, from the slowest step.
+    """
+    profiles = _profiles or {}
+    walls = {step.step: step.wall for step in _steps if step.step in profiles}
+    slowest = sorted(walls, key=walls.__getitem__, reverse=True)[:count]
+
+    Path(folder).mkdir(parents=True, exist_ok=True)
+    paths: list[Path] = []
+    for index, step in enumerate(slowest):
+        name = re.sub(r"\W+", "-", step).strip("-").lower()
+        paths.append(Path(folder, f"{index + 1:02}-{name}.prof"))
+        profiles[step].dump_stats(paths[-1])
+    return paths
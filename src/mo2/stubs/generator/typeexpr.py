@@ -0,0 +1,334 @@
+from __future__ import annotations
+
+import re
+from collections.abc import Callable, Collection, Mapping
+from dataclasses import dataclass
+from typing import Final
+
+from .timing import increment
+
+
+@dataclass(frozen=True, slots=True)
+class TypeName:
+    """
+    A (possibly dotted) name, e.g., int or mobase.IFileTree.
+    """
+
+    name: str
+
+
+@dataclass(frozen=True, slots=True)
+class TypeSubscript:
+    """
+    A subscripted type, e.g., dict[str, int].
+    """
+
+    value: TypeExpr
+    args: tuple[TypeExpr, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class TypeList:
+    """
+    A list of types, e.g., the arguments in Callable[[int, str], None].
+    """
+
+    items: tuple[TypeExpr, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class TypeUnion:
+    """
+    A union of types, e.g., str | None.
+    """
+
+    items: tuple[TypeExpr, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class TypeLiteral:
+    """
+    A literal (string, number) or a type that could not be parsed, kept as-is.
+    """
+
+    text: str
+
+
+type TypeExpr = TypeName | TypeSubscript | TypeList | TypeUnion | TypeLiteral
+
+_TOKENS: Final = re.compile(
+    r"\s*(?:(?P<name>\.\.\.|[^\W\d][\w.]*)"
+    r"|(?P<literal>-?\d[\w.]*|'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\")"
+    r"|(?P<op>[\[\],|]))"
+)
+
+_NONE_NAMES: Final = frozenset(("None", "NoneType"))
+
+
+class _Parser:
+    def __init__(self, text: str):
+        self.text = text
+        self.tokens: list[tuple[str, str]] = []
+
+        pos = 0
+        end = len(text.rstrip())
+        while pos < end:
+            m = _TOKENS.match(text, pos)
+            if m is None or m.lastgroup is None:
+                raise ValueError(f"invalid type: {text}")
+            self.tokens.append((m.lastgroup, m.group(m.lastgroup)))
+            pos = m.end()
+
+        self.index = 0
+
+    def peek(self) -> str | None:
+        if self.index < len(self.tokens):
+            return self.tokens[self.index][1]
+        return None
+
+    def expect(self, value: str):
+        if self.peek() != value:
+            raise ValueError(f"invalid type: {self.text}")
+        self.index += 1
+
+    def parse(self) -> TypeExpr:
+        expr = self.parse_union()
+        if self.index != len(self.tokens):
+            raise ValueError(f"invalid type: {self.text}")
+        return expr
+
+    def parse_union(self) -> TypeExpr:
+        items = [self.parse_primary()]
+        while self.peek() == "|":
+            self.index += 1
+            items.append(self.parse_primary())
+        return union(*items)
+
+    def parse_sequence(self) -> tuple[TypeExpr, ...]:
+        # parse "a, b, c]" including the closing bracket
+        items: list[TypeExpr] = []
+        while self.peek() != "]":
+            items.append(self.parse_union())
+            if self.peek() != ",":
+                break
+            self.index += 1
+        self.expect("]")
+        return tuple(items)
+
+    def parse_primary(self) -> TypeExpr:
+        if self.index >= len(self.tokens):
+            raise ValueError(f"invalid type: {self.text}")
+
+        kind, value = self.tokens[self.index]
+        self.index += 1
+
+        if kind == "literal":
+            return TypeLiteral(value)
+
+        if kind == "op":
+            if value != "[":
+                raise ValueError(f"invalid type: {self.text}")
+            return TypeList(self.parse_sequence())
+
+        expr: TypeExpr = TypeName(value)
+        if self.peek() == "[":
+            self.index += 1
+            expr = TypeSubscript(expr, self.parse_sequence())
+        return expr
+
+
+def parse_type(text: str) -> TypeExpr:
+    """
+    Parse the given type.
+
+    Args:
+        text: The type to parse, e.g., "dict[str, int] | None".
+
+    Returns:
+        The parsed type, or a TypeLiteral containing the text if it could not
+        be parsed.
+    """
+    increment("types.parsed")
+    try:
+        return _Parser(text).parse()
+    except ValueError:
+        return TypeLiteral(text.strip())
+
+
+def render_type(expr: TypeExpr) -> str:
+    """
+    Render the given type.
+
+    Args:
+        expr: The type to render.
+
+    Returns:
+        A string representation of the type.
+    """
+    match expr:
+        case TypeName(name):
+            return name
+        case TypeSubscript(value, args):
+            return f"{render_type(value)}[{', '.join(map(render_type, args))}]"
+        case TypeList(items):
+            return f"[{', '.join(map(render_type, items))}]"
+        case TypeUnion(items):
+            return " | ".join(map(render_type, items))
+        case TypeLiteral(text):
+            return text
+
+
+def union(*items: TypeExpr) -> TypeExpr:
+    """
+    Create the union of the given types, flattening nested unions.
+    """
+    flat: list[TypeExpr] = []
+    for item in items:
+        if isinstance(item, TypeUnion):
+            flat.extend(item.items)
+        else:
+            flat.append(item)
+
+    if len(flat) == 1:
+        return flat[0]
+    return TypeUnion(tuple(flat))
+
+
+def transform_type(
+    expr: TypeExpr, fn: Callable[[TypeExpr], TypeExpr | None]
+) -> TypeExpr:
+    """
+    Rewrite the given type top-down.
+
+    Args:
+        expr: The type to rewrite.
+        fn: Function called on each node, returning a replacement for the node (which
+            is not rewritten further) or None to rewrite the children of the node.
+
+    Returns:
+        The rewritten type.
+    """
+    replacement = fn(expr)
+    if replacement is not None:
+        return replacement
+
+    match expr:
+        case TypeSubscript(value, args):
+            return TypeSubscript(
+                transform_type(value, fn),
+                tuple(transform_type(arg, fn) for arg in args),
+            )
+        case TypeList(items):
+            return TypeList(tuple(transform_type(item, fn) for item in items))
+        case TypeUnion(items):
+            return union(*(transform_type(item, fn) for item in items))
+        case _:
+            return expr
+
+
+# rewrite passes
+
+
+def strip_qflags(expr: TypeExpr) -> TypeExpr:
+    """
+    Replace QFlags[X] by X.
+    """
+
+    def _fn(e: TypeExpr) -> TypeExpr | None:
+        if (
+            isinstance(e, TypeSubscript)
+            and isinstance(e.value, TypeName)
+            and e.value.name.split(".")[-1] == "QFlags"
+            and len(e.args) == 1
+        ):
+            return strip_qflags(e.args[0])
+        return None
+
+    return transform_type(expr, _fn)
+
+
+def qualify_names(expr: TypeExpr, qualify: Callable[[str], str]) -> TypeExpr:
+    """
+    Qualify every non-dotted name in the given type, e.g., QWidget to
+    PyQt6.QtWidgets.QWidget.
+    """
+
+    def _fn(e: TypeExpr) -> TypeExpr | None:
+        if isinstance(e, TypeName) and "." not in e.name:
+            return TypeName(qualify(e.name))
+        return None
+
+    return transform_type(expr, _fn)
+
+
+def rename_types(expr: TypeExpr, names: Mapping[str, str]) -> TypeExpr:
+    """
+    Rename the names in the given type using the given mapping.
+    """
+
+    def _fn(e: TypeExpr) -> TypeExpr | None:
+        if isinstance(e, TypeName) and e.name in names:
+            return TypeName(names[e.name])
+        return None
+
+    return transform_type(expr, _fn)
+
+
+def parametrize_types(expr: TypeExpr, parameters: Mapping[str, TypeExpr]) -> TypeExpr:
+    """
+    Add parameters to names that are not subscripted, e.g., os.PathLike to
+    os.PathLike[str].
+    """
+
+    def _fn(e: TypeExpr) -> TypeExpr | None:
+        if isinstance(e, TypeSubscript) and isinstance(e.value, TypeName):
+            return TypeSubscript(
+                e.value, tuple(parametrize_types(arg, parameters) for arg in e.args)
+            )
+        if isinstance(e, TypeName) and e.name in parameters:
+            return TypeSubscript(e, (parameters[e.name],))
+        return None
+
+    return transform_type(expr, _fn)
+
+
+def strip_packages(expr: TypeExpr, packages: Collection[str]) -> TypeExpr:
+    """
+    Remove the given packages from the qualified names in the given type, e.g.,
+    mobase.IFileTree to IFileTree.
+    """
+
+    def _fn(e: TypeExpr) -> TypeExpr | None:
+        if isinstance(e, TypeName) and "." in e.name:
+            parts = e.name.split(".")
+            return TypeName(
+                ".".join([p for p in parts[:-1] if p not in packages] + parts[-1:])
+            )
+        return None
+
+    return transform_type(expr, _fn)
+
+
+def is_optional(expr: TypeExpr, optional_names: Collection[str] = ()) -> bool:
+    """
+    Check if the given type accepts None, i.e., is None, a union containing None
+    or a type whose last name component is in optional_names.
+    """
+    match expr:
+        case TypeName(name):
+            return name in _NONE_NAMES or name.split(".")[-1] in optional_names
+        case TypeSubscript(TypeName(name), _):
+            return name.split(".")[-1] == "Optional"
+        case TypeUnion(items):
+            return any(is_optional(item, optional_names) for item in items)
+        case _:
+            return False
+
+
+def make_optional(expr: TypeExpr, optional_names: Collection[str] = ()) -> TypeExpr:
+    """
+    Add None to the given type, unless it already accepts None (see is_optional()).
+    """
+    if is_optional(expr, optional_names):
+        return expr
+    return union(expr, TypeName("None"))
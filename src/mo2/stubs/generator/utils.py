@@ -1,12 +1,12 @@
 from __future__ import annotations
 
 import logging
-from collections import OrderedDict, defaultdict
-from typing import TYPE_CHECKING, Final, NamedTuple, TextIO, TypedDict, cast
-
-import yaml
+from collections import Counter, OrderedDict, defaultdict
+from collections.abc import Collection, Mapping
+from typing import TYPE_CHECKING, Any, Final, NamedTuple, TextIO, TypedDict, cast
 
 from .mtypes import (
+    RENAMED_CLASSES,
     Argument,
     Class,
     Constant,
@@ -19,12 +19,56 @@ from .mtypes import (
     PyType,
     Return,
 )
+from .timing import increment
 
 if TYPE_CHECKING:
-    from .register import MobaseRegister
+    from .register import ClassGraph, MobaseRegister
 
 LOGGER = logging.getLogger(__package__)
 
+# keys of the settings of a function
+_FUNCTION_KEYS: Final = frozenset(
+    ("__doc__", "abstract", "deprecated", "args", "returns", "raises")
+)
+
+
+def load_settings(fp: TextIO | str) -> dict[str, Any]:
+    """
+    Load the content of a configuration file, shared by the settings of all modules.
+
+    Args:
+        fp: The configuration file to load, or its content.
+
+    Returns:
+        The content of the configuration file.
+    """
+    # imported only here so that the modes that do not read a configuration do not
+    # pay for it
+    import yaml
+
+    # the C loader (when PyYAML is built with libyaml) is about 10 times faster than
+    # the pure-Python one on the configuration files
+    data = yaml.load(fp, getattr(yaml, "CFullLoader", yaml.FullLoader))
+    assert data["version"] == 2, "only settings version 2 are supported"
+    return data
+
+
+class Coverage(NamedTuple):
+    """
+    Coverage of an object by the settings, see Settings.check_class().
+    """
+
+    # canonical name of the class, or name of the function
+    name: str
+
+    # settings names (e.g., foo or foo.1 for methods) of the members found in the
+    # settings, and of the members missing from the settings
+    documented: list[str]
+    undocumented: list[str]
+
+    # entries of the settings that do not match any member
+    unknown: list[str]
+
 
 class Settings:
     class YamlFunctionArgument(TypedDict, total=False):
@@ -72,6 +116,26 @@ class Settings:
         abstract: bool | None = None
         deprecated: bool = False
 
+    class PyPropertySettings(NamedTuple):
+        # None if the type is missing from the settings
+        type: PyType | None
+        desc: str | None
+        has_desc: bool
+
+    class PyClassSettings(NamedTuple):
+        doc: str | None
+        bases: list[str]
+        abstract: bool
+        properties: dict[str, Settings.PyPropertySettings]
+        signals: list[str]
+
+        # settings of the methods, by name (e.g., foo or foo.1), or the error raised
+        # when parsing them (the entry might not be a method)
+        functions: dict[str, Settings.PyFunctionSettings | BaseException]
+
+        # the other entries, i.e., methods, inner classes and constants
+        members: list[str]
+
     register: MobaseRegister
 
     version: Final[str]
@@ -85,48 +149,155 @@ class Settings:
     # Content of mobase:
     _module: dict[str, dict[str, object]]
 
+    # Compiled settings of the module functions and of the classes, by canonical name:
+    _functions: dict[str, PyFunctionSettings | BaseException]
+    _classes: dict[str, PyClassSettings]
+
     def __init__(
         self,
         register: MobaseRegister,
-        fp: TextIO | None = None,
+        data: dict[str, Any] | None = None,
         module: str | None = None,
     ):
+        """
+        Args:
+            register: The register of mobase objects.
+            data: The content of the configuration file, from load_settings(), or
+                None to create empty settings.
+            module: The module to retrieve the settings for, required with data.
+        """
         self.register = register
 
-        if fp is None:
+        if data is None:
             self._ignore_names = []
             self._replacements = {}
             self._version = ""
             self._module = {}
         else:
-            data = yaml.load(fp, yaml.FullLoader)
-            assert data["version"] == 2, "only settings version 2 are supported"
-
             # retrieve the module version
             self.version = data["__version__"]
 
             assert module is not None
             self._module = data.get(module, None) or {}
 
-    def _get_class_settings(self, canonical_name: str) -> YamlClassSettings | None:
+        self._functions, self._classes = self._compile_settings(self._module)
+
+    def get_object_settings(self, name: str) -> dict[str, object]:
         """
-        Retrieve the settings for the given class.
+        Retrieve all the settings of the given top-level object of the module, i.e.,
+        the settings of a class or of all the overloads of a function.
 
         Args:
-            canonical_name: Canonical name of the class.
+            name: Name of the object in mobase.
 
         Returns:
-            The settings for the corresponding class, or None if the
-            settings where not found.
+            A mapping from settings name to settings, empty if the object has no
+            settings.
         """
-        parts = canonical_name.split(".")
-        base: dict[str, object] = dict(self._module)
-        for part in parts:
-            if part in base:
-                base = base[part]  # type: ignore
-            else:
-                return None
-        return base  # type: ignore
+        names = {name, RENAMED_CLASSES.get(name, name)}
+        return {k: v for k, v in self._module.items() if k.split(".")[0] in names}
+
+    def _compile_function_settings(
+        self, settings: object
+    ) -> PyFunctionSettings | BaseException:
+        try:
+            return self._parse_function_settings(settings)  # type: ignore
+        except (AttributeError, TypeError, ValueError) as err:
+            # not a function, or invalid settings - the error is raised if the
+            # settings are actually used for a function
+            return err
+
+    def _compile_settings(
+        self, module: Mapping[str, object]
+    ) -> tuple[
+        dict[str, PyFunctionSettings | BaseException], dict[str, PyClassSettings]
+    ]:
+        """
+        Compile the settings of the given module.
+
+        Since the settings do not tell classes from functions, every entry is
+        compiled as a function and every dictionary as a class.
+
+        Args:
+            module: The settings of the module.
+
+        Returns:
+            A tuple (functions, classes) where functions contains the settings of the
+            module functions, by name, and classes contains the settings of the
+            classes, by canonical name.
+        """
+        functions = {
+            name: self._compile_function_settings(value)
+            for name, value in module.items()
+        }
+
+        classes: dict[str, Settings.PyClassSettings] = {}
+        stack = [(name, value) for name, value in module.items() if "." not in name]
+        while stack:
+            canonical_name, value = stack.pop()
+            if not isinstance(value, dict):
+                continue
+
+            class_settings = cast(dict[str, object], value)
+
+            # skip settings that can only be function settings
+            if class_settings.keys() <= _FUNCTION_KEYS and class_settings.keys() - {
+                "__doc__"
+            }:
+                continue
+
+            classes[canonical_name] = self._compile_class_settings(class_settings)
+            stack.extend(
+                (f"{canonical_name}.{name}", value)
+                for name, value in class_settings.items()
+                if "." not in name and name not in ("properties[]", "signals[]")
+            )
+
+        return functions, classes
+
+    def _compile_class_settings(self, settings: dict[str, object]) -> PyClassSettings:
+        yaml_settings = cast(Settings.YamlClassSettings, settings)
+
+        properties: dict[str, Settings.PyPropertySettings] = {}
+        for name, value in yaml_settings.get("properties[]", {}).items():
+            value = value or cast(Settings.YamlClassProperty, {})
+            properties[name] = Settings.PyPropertySettings(
+                PyType(value["type"]) if "type" in value else None,
+                value.get("desc"),
+                "desc" in value,
+            )
+
+        abstract = bool(yaml_settings.get("__abstract__", False))
+
+        # __abstract__ is only removed when true (and reported as a missing member
+        # otherwise)
+        special_names = {"__doc__", "__bases__", "properties[]", "signals[]"}
+        if abstract:
+            special_names.add("__abstract__")
+        members = [name for name in settings if name not in special_names]
+
+        return Settings.PyClassSettings(
+            doc=yaml_settings.get("__doc__"),
+            bases=list(yaml_settings.get("__bases__", [])),
+            abstract=abstract,
+            properties=properties,
+            signals=list(yaml_settings.get("signals[]", [])),
+            functions={
+                name: self._compile_function_settings(settings[name])
+                for name in members
+            },
+            members=members,
+        )
+
+    def _get_function_settings(
+        self,
+        functions: dict[str, PyFunctionSettings | BaseException],
+        name: str,
+    ) -> PyFunctionSettings:
+        settings = functions[name]
+        if isinstance(settings, BaseException):
+            raise settings
+        return settings
 
     def _parse_function_settings(
         self, settings: str | YamlFunctionSettings | None
@@ -195,6 +366,92 @@ class Settings:
             doc, args, ret, exceptions, abstract, deprecated
         )
 
+    def unknown_objects(self, names: Collection[str]) -> list[str]:
+        """
+        Find the entries of the settings of the module that do not match any of the
+        given top-level objects.
+
+        Args:
+            names: Names of the top-level objects of the module.
+        """
+        known = set(names) | {RENAMED_CLASSES.get(n, n) for n in names}
+        return [k for k in self._module if k.split(".")[0] not in known]
+
+    def check_functions(self, fns: list[Function]) -> Coverage:
+        """
+        Compare the settings of the given function with its overloads, without
+        patching it (see patch_functions()).
+        """
+        names = [
+            "{}.{}".format(fn.name, i + 1) if fn.has_overloads() else fn.name
+            for i, fn in enumerate(fns)
+        ]
+        documented = set(names) & self._functions.keys()
+        return Coverage(
+            fns[0].name,
+            [n for n in names if n in documented],
+            [n for n in names if n not in documented],
+            [],
+        )
+
+    def check_class(self, cls: Class) -> list[Coverage]:
+        """
+        Compare the settings of the given class with its methods, properties and
+        enumeration values, and the settings of its inner classes with theirs,
+        without patching them (see patch_class(), which must be called after).
+
+        Returns:
+            The coverage of the class followed by the coverage of its inner classes.
+        """
+        # settings names of the methods, as in patch_class()
+        index: Counter[str] = Counter()
+        methods: list[str] = []
+        for m in cls.methods:
+            index[m.name] += 1
+            methods.append(
+                "{}.{}".format(m.name, index[m.name]) if m.has_overloads() else m.name
+            )
+
+        # the properties of enumerations (name and value) come from pybind11
+        properties: list[str] = []
+        values: list[str] = []
+        if isinstance(cls, Enum):
+            values = [c.name for c in cls.constants]
+        else:
+            properties = [p.name for p in cls.properties]
+
+        # the class is renamed by patch_class()
+        name = RENAMED_CLASSES.get(cls.canonical_name, cls.canonical_name)
+
+        class_settings = self._classes.get(name)
+        keys: list[str] = []
+        described: set[str] = set()
+        if class_settings is not None:
+            keys = class_settings.members
+            described = {n for n, p in class_settings.properties.items() if p.has_desc}
+
+        members = methods + properties + values
+        documented = (set(methods + values) & set(keys)) | (set(properties) & described)
+        known = (
+            set(methods)
+            | {c.name for c in cls.constants}
+            | {ic.name for ic in cls.inner_classes}
+        )
+
+        coverages = [
+            Coverage(
+                name,
+                [n for n in members if n in documented],
+                # special methods are not required to be in the settings
+                [n for n in members if n not in documented and not n.startswith("__")],
+                [k for k in keys if k not in known],
+            )
+        ]
+        for ic in cls.inner_classes:
+            coverages.extend(self.check_class(ic))
+
+        return coverages
+
     def patch_functions(self, fns: list[Function]):
         for i, fn in enumerate(fns):
             # Find the name in settings:
@@ -204,9 +461,11 @@ class Settings:
                 setting_name = fn.name
 
             # If the name is in the settings:
-            if setting_name in self._module:
-                function_settings = self._parse_function_settings(
-                    self._module[setting_name]  # type: ignore
+            found = setting_name in self._functions
+            increment("settings.hits" if found else "settings.misses")
+            if found:
+                function_settings = self._get_function_settings(
+                    self._functions, setting_name
                 )
 
                 # Force raises:
@@ -261,50 +520,43 @@ class Settings:
         LOGGER.info("Patching class {}.".format(cls.name))
 
         # fix the name
-        if cls.name == "IPluginBase":
-            cls.name = "IPlugin"
+        cls.name = RENAMED_CLASSES.get(cls.name, cls.name)
 
         # Find the class in mobase:
-        class_settings = self._get_class_settings(cls.canonical_name)
+        class_settings = self._classes.get(cls.canonical_name)
+        increment("settings.misses" if class_settings is None else "settings.hits")
 
         if class_settings is None:
             LOGGER.warning("Class {} not found in settings.".format(cls.canonical_name))
             return
 
-        if "__doc__" in class_settings and class_settings["__doc__"] is not None:
-            cls.doc = class_settings["__doc__"]
-        class_settings.pop("__doc__", None)
+        if class_settings.doc is not None:
+            cls.doc = class_settings.doc
 
         # Check bases:
-        if "__bases__" in class_settings:
-            for bc in class_settings["__bases__"]:
-                if bc.startswith("PyQt"):
-                    parts = bc.split(".")
-                    cls.bases.append(
-                        PyClass(package=".".join(parts[:-1]), name=parts[-1])
-                    )
-                else:
-                    class_ = self.register.get_object(bc)
-                    assert isinstance(class_, Class)
-                    cls.bases.append(class_)
-            del class_settings["__bases__"]
+        for bc in class_settings.bases:
+            if bc.startswith("PyQt"):
+                parts = bc.split(".")
+                cls.bases.append(PyClass(package=".".join(parts[:-1]), name=parts[-1]))
+            else:
+                class_ = self.register.get_object(bc)
+                assert isinstance(class_, Class)
+                cls.bases.append(class_)
+
+        if class_settings.bases:
+            self.register.class_graph.invalidate()
 
-        if "__abstract__" in class_settings and class_settings["__abstract__"]:
+        if class_settings.abstract:
             cls.abstract = True
-            del class_settings["__abstract__"]
 
         # Patch properties - Everything should be in config since property are poorly
         # documented by boost::python.
-        properties: dict[str, Settings.YamlClassProperty] = class_settings.pop(
-            "properties[]", cast(dict[str, Settings.YamlClassProperty], {})
-        )
         for prop in cls.properties:
-            if prop.name in properties:
-                settings_property = properties[prop.name]
-
+            settings_property = class_settings.properties.get(prop.name)
+            if settings_property is not None:
                 # If we have a type:
-                if "type" in settings_property:
-                    prop.type = PyType(settings_property["type"])
+                if settings_property.type is not None:
+                    prop.type = settings_property.type
                 else:
                     LOGGER.warning(
                         "Missing type for property {}.{}.".format(
@@ -313,11 +565,11 @@ class Settings:
                     )
 
                 # If we have a description:
-                if "desc" in settings_property:
+                if settings_property.has_desc:
                     # If desc is None, we do not warn user, because the entry is in
                     # settings, just empty:
-                    if settings_property["desc"] is not None:
-                        prop.doc = settings_property["desc"]
+                    if settings_property.desc is not None:
+                        prop.doc = settings_property.desc
 
                 else:
                     LOGGER.warning(
@@ -328,12 +580,11 @@ class Settings:
 
         # patch signals - Everything should be in config since signals are not really
         # exposed by pybind11.
-        signals: list[str] = list(class_settings.pop("signals[]", cast(list[str], [])))
-        for signal in signals:
+        for signal in class_settings.signals:
             cls.constants.append(Constant(signal, PyType("pyqtSignal"), None))
 
         # List of all items in class_settings:
-        keys = {k: False for k in class_settings}
+        keys = dict.fromkeys(class_settings.members, False)
 
         # Group method by name:
         methods: dict[str, list[Method]] = defaultdict(list)
@@ -350,10 +601,12 @@ class Settings:
                     settings_name = m.name
 
                 # If the name is in the settings:
-                if settings_name in class_settings:
+                found = settings_name in class_settings.functions
+                increment("settings.hits" if found else "settings.misses")
+                if found:
                     keys[settings_name] = True
-                    function_settings = self._parse_function_settings(
-                        class_settings[settings_name]  # type: ignore
+                    function_settings = self._get_function_settings(
+                        class_settings.functions, settings_name
                     )
 
                     # Force raises:
@@ -416,13 +669,8 @@ class Settings:
                 elif not m.name.startswith("__"):
                     missing_settings.add(settings_name)
 
-            # remove the deprecated methods and count overloads
-            n_overloads = 0
-            for m in ms:
-                if m.is_deprecated():
-                    cls.methods.remove(m)
-                else:
-                    n_overloads += 1
+            # count overloads (deprecated methods are removed below)
+            n_overloads = sum(not m.is_deprecated() for m in ms)
 
             for m in ms:
                 m.overloads = n_overloads > 1
@@ -435,6 +683,10 @@ class Settings:
                         )
                     )
 
+        # remove the deprecated methods
+        cls.methods = [m for m in cls.methods if not m.is_deprecated()]
+        self.register.class_graph.invalidate_methods(cls)
+
         # Patch inner classes:
         for ic in cls.inner_classes:
             keys[ic.name] = True
@@ -453,12 +705,13 @@ class Settings:
             )
 
 
-def clean_class(cls: Class):
+def clean_class(cls: Class, graph: ClassGraph):
     """
     Clean the given class object.
 
     Args:
         cls: The class object to clean.
+        graph: The inheritance graph of the classes.
     """
 
     # Remove duplicate methods (based on name and argument types):
@@ -471,6 +724,9 @@ def clean_class(cls: Class):
         methods[k].append(m)
         methods_by_name[m.name].append(m)
 
+    # methods of the bases, by name
+    base_methods = graph.inherited_methods(cls)
+
     clean_methods: list[Method] = []
     for name, args in methods:
         ms = methods[name, args]
@@ -481,7 +737,7 @@ def clean_class(cls: Class):
             assert (
                 ms[0].ret.type.is_none()
                 or ms[1].ret.type.is_none()
-                or ms[0].ret.type.name == ms[1].ret.type.name
+                or ms[0].ret.type is ms[1].ret.type
             )
 
             if ms[0].ret.type.is_none():
@@ -518,24 +774,23 @@ def clean_class(cls: Class):
 
             if method.name != "__init__":
                 # we need to fix the overload from the base class
-                for base_class in cls.all_bases:
-                    for base_method in base_class.methods:
-                        if base_method.name == method.name:
-                            # we need to bring all overloads
-                            base_method = Method(
-                                base_method.name,
-                                ret=base_method.ret,
-                                args=base_method.args,
-                                static=False,
-                                has_overloads=True,
-                                doc=base_method.doc,
-                            )
-                            base_method.cls = cls
-                            clean_methods.insert(-1, base_method)
+                for base_method in base_methods.get(method.name, []):
+                    # we need to bring all overloads
+                    base_method = Method(
+                        base_method.name,
+                        ret=base_method.ret,
+                        args=base_method.args,
+                        static=False,
+                        has_overloads=True,
+                        doc=base_method.doc,
+                    )
+                    base_method.cls = cls
+                    clean_methods.insert(-1, base_method)
 
-                            method.overloads = True
+                    method.overloads = True
 
     cls.methods = clean_methods
+    graph.invalidate_methods(cls)
 
     # Remove all non-uppercases enum names - This is a temporary fix to avoid breaking
     # old plugins that uses old enum values:
@@ -567,4 +822,4 @@ def clean_class(cls: Class):
 
     # Clean inner classes:
     for ic in cls.inner_classes:
-        clean_class(ic)
+        clean_class(ic, graph)
@@ -1,13 +1,32 @@
-import logging
-from typing import Any, TextIO
-
-from typing_extensions import TypeIs
+from __future__ import annotations
 
-from .mtypes import Class, Constant, Enum, Function, Method, Property, PyTyping
+import logging
+import re
+import sys
+from typing import TYPE_CHECKING, Any
+
+from .mtypes import (
+    Class,
+    Constant,
+    Function,
+    Method,
+    Property,
+    PyType,
+    PyTyping,
+)
+from .typeexpr import render_type, strip_packages
 from .utils import Settings
 
+if TYPE_CHECKING:
+    from typing_extensions import TypeIs
+
 LOGGER = logging.getLogger(__package__)
 
+# maximum length of the lines of the stubs, as for ruff format
+LINE_LENGTH = 88
+
+_STRING_RE = re.compile(r"\"(?:[^\"\\]|\\.)*\"|'(?:[^'\\]|\\.)*'")
+
 
 def is_list_of_any(e: Any) -> TypeIs[list[Any]]:
     return isinstance(e, list)
@@ -17,28 +36,88 @@ def is_list_of[T](e: Any, t: type[T]) -> TypeIs[list[T]]:
     return is_list_of_any(e) and all(isinstance(x, t) for x in e)
 
 
+def _requote(match: re.Match[str]) -> str:
+    literal = match.group()
+    body = literal[1:-1]
+    if literal[0] == '"' or body.count('"') > body.count("'"):
+        return literal
+
+    return '"' + re.sub(r'\\.|"', _swap_escape, body) + '"'
+
+
+def _swap_escape(match: re.Match[str]) -> str:
+    return {"\\'": "'", '"': '\\"'}.get(match.group(), match.group())
+
+
+def normalize_strings(expr: str) -> str:
+    """
+    Use double quotes for the string literals of the given expression, unless this
+    requires more escapes, as ruff format does.
+    """
+    if "'" not in expr:
+        return expr
+    return _STRING_RE.sub(_requote, expr)
+
+
+def _import_section(module: str) -> int:
+    # sections of the imports: __future__, standard library and third-party
+    root = module.split(".")[0]
+    if root == "__future__":
+        return 0
+    if root in sys.stdlib_module_names:
+        return 1
+    return 2
+
+
+def _member_key(name: str) -> tuple[int, str, str]:
+    # constants, classes and then everything else (ruff's order-by-type)
+    if name.isupper() and len(name) > 1:
+        kind = 0
+    elif name[:1].isupper():
+        kind = 1
+    else:
+        kind = 2
+    return kind, name.lower(), name
+
+
 class Writer:
-    _output: TextIO
+    """
+    Render stubs into an in-memory buffer, retrieved with take().
+    """
+
+    _parts: list[str]
     _settings: Settings
 
-    def __init__(self, package: str, output: TextIO, settings: Settings):
-        self._package = package.split(".")
-        self._output = output
+    def __init__(self, package: str, settings: Settings):
+        self._package = frozenset(package.split("."))
+        self._parts = []
         self._settings = settings
+        self._typings: dict[PyType, str] = {}
 
-    def _fix_typing(self, value: str) -> str:
-        for pkg in self._package:
-            value = value.replace(pkg + ".", "")
-        return value
+    def take(self) -> str:
+        """
+        Retrieve the text rendered since the last call and empty the buffer.
+        """
+        text = "".join(self._parts)
+        self._parts.clear()
+        return text
+
+    def _fix_typing(self, type: PyType) -> str:
+        """
+        Retrieve the typing representation of the given type, without the package
+        of this writer (e.g., mobase.IFileTree to IFileTree).
+        """
+        typing = self._typings.get(type)
+        if typing is None:
+            typing = normalize_strings(
+                render_type(strip_packages(type.typing_expr, self._package))
+            )
+            self._typings[type] = typing
+        return typing
 
-    def _print(
-        self,
-        *values: object,
-        sep: str | None = " ",
-        end: str | None = "\n",
-        flush: bool = False,
-    ) -> None:
-        print(*values, sep=sep, end=end, flush=flush, file=self._output)
+    def _print(self, value: str = "", end: str = "\n") -> None:
+        self._parts.append(value)
+        self._parts.append(end)
 
     def _print_doc(self, doc: str, indent: str):
         """
@@ -48,9 +127,15 @@ class Writer:
             doc: Documentation to print.
             indent: Indentation.
         """
-        # Wrap in triple quotes:
-        doc = '"""\n' + doc.strip() + '\n"""'
-        self._print("\n".join((indent + line).rstrip() for line in doc.split("\n")))
+        # Wrap in triple quotes, indenting non-blank lines:
+        self._parts.append(indent + '"""\n')
+        for line in doc.strip().split("\n"):
+            line = line.rstrip()
+            if line:
+                self._parts.append(indent)
+                self._parts.append(line)
+            self._parts.append("\n")
+        self._parts.append(indent + '"""\n')
 
     def print_version(self, version: str):
         self._print('__version__ = "{}"'.format(version))
@@ -58,14 +143,69 @@ class Writer:
 
     def print_imports(self, imports: list[str | tuple[str, list[str]]]):
         """
-        Print the given imports.
+        Print the given imports, sorted and grouped by sections (__future__, standard
+        library and third-party) as ruff (isort) does.
         """
+        modules: list[set[str]] = [set(), set(), set()]
+        members: list[dict[str, set[str]]] = [{}, {}, {}]
         for imp in imports:
             if isinstance(imp, str):
-                self._print("import {}".format(imp))
+                modules[_import_section(imp)].add(imp)
             else:
-                self._print("from {} import {}".format(imp[0], ", ".join(imp[1])))
-        self._print()
+                members[_import_section(imp[0])].setdefault(imp[0], set()).update(
+                    imp[1]
+                )
+
+        for section in range(len(modules)):
+            for module in sorted(modules[section], key=lambda m: (m.lower(), m)):
+                self._print("import {}".format(module))
+
+            for module in sorted(members[section], key=lambda m: (m.lower(), m)):
+                names = sorted(members[section][module], key=_member_key)
+                line = "from {} import {}".format(module, ", ".join(names))
+                if len(line) <= LINE_LENGTH:
+                    self._print(line)
+                else:
+                    self._print("from {} import (".format(module))
+                    for name in names:
+                        self._print("    {},".format(name))
+                    self._print(")")
+
+            if modules[section] or members[section]:
+                self._print()
+
+    def _print_signature(
+        self, indent: str, head: str, args: list[str], tail: str, is_def: bool
+    ):
+        """
+        Print a signature (of a function or a class) at the given indentation level,
+        split as ruff format does if it does not fit on a single line.
+
+        Args:
+            indent: Indentation.
+            head: Beginning of the signature, up to the opening parenthesis.
+            args: Arguments of the signature.
+            tail: End of the signature, from the closing parenthesis.
+            is_def: True for a function, whose single argument gets a trailing comma
+                when split.
+        """
+        line = "{}{}{}{}".format(indent, head, ", ".join(args), tail)
+        if len(line) <= LINE_LENGTH or not args:
+            self._print(line)
+            return
+
+        # Split after the opening parenthesis, with the arguments on a single line if
+        # they fit, otherwise with one argument per line and a trailing comma:
+        self._print(indent + head)
+        inner = ", ".join(args)
+        if len(indent) + 4 + len(inner) <= LINE_LENGTH and (
+            len(args) > 1 or not is_def
+        ):
+            self._print("{}    {}".format(indent, inner))
+        else:
+            for arg in args:
+                self._print("{}    {},".format(indent, arg))
+        self._print(indent + tail)
 
     def print_function(self, fn: Function, indent: str = ""):
         """
@@ -77,7 +217,7 @@ class Writer:
 
         sig_return_type = ""
         if not fn.ret.type.is_none():
-            sig_return_type = " -> " + self._fix_typing(fn.ret.type.typing())
+            sig_return_type = " -> " + self._fix_typing(fn.ret.type)
         else:
             sig_return_type = " -> None"
 
@@ -90,61 +230,55 @@ class Writer:
 
         python_args: list[str] = []
         for arg in fn.args:
-            tmp = "{}: {}".format(arg.name, self._fix_typing(arg.type.typing()))
-            if arg.has_default_value():
-                tmp += " = {}".format(arg.value)
+            tmp = "{}: {}".format(arg.name, self._fix_typing(arg.type))
+            value = arg.value
+            if value is not None:
+                tmp += " = {}".format(normalize_strings(value))
             python_args.append(tmp)
 
-        self._print(
-            "{}def {}({}){}:".format(
-                indent, fn.name, ", ".join(python_args), sig_return_type
-            ),
-            end="",
-        )
-
-        # Add the documentation, if any:
-        doc = ""
+        # Build the documentation, if any:
+        doc_parts: list[str] = []
 
         if fn.doc:
-            doc = fn.doc.strip() + "\n"
+            doc_parts += [fn.doc.strip(), "\n"]
 
         args = fn.args
         if isinstance(fn, Method) and not fn.is_static():
             args = args[1:]
 
         if any(arg.doc for arg in args):
-            doc += "\nArgs:\n"
+            doc_parts.append("\nArgs:\n")
             for arg in args:
-                arg_doc_list = arg.doc.strip().split("\n")
-                arg_doc = "\n".join(
-                    [arg_doc_list[0]]
-                    + ["        " + line_doc for line_doc in arg_doc_list[1:]]
-                )
-                doc += "    " + arg.name + ": " + arg_doc + "\n"
+                arg_doc = arg.doc.strip().replace("\n", "\n        ")
+                doc_parts += ["    ", arg.name, ": ", arg_doc, "\n"]
 
         if not fn.ret.type.is_none() and fn.ret.doc:
-            doc += "\nReturns:\n    " + fn.ret.doc.strip() + "\n"
+            doc_parts += ["\nReturns:\n    ", fn.ret.doc.strip(), "\n"]
 
         if fn.raises:
-            doc += "\nRaises:\n"
+            doc_parts.append("\nRaises:\n")
             for rai in fn.raises:
-                doc += (
-                    "    "
-                    + self._fix_typing(rai.type.typing())
-                    + ": "
-                    + rai.doc.strip()
-                    + "\n"
-                )
+                doc_parts += [
+                    "    ",
+                    self._fix_typing(rai.type),
+                    ": ",
+                    rai.doc.strip(),
+                    "\n",
+                ]
+
+        doc = "".join(doc_parts)
+
+        self._print_signature(
+            indent,
+            "def {}(".format(fn.name),
+            python_args,
+            "){}:{}".format(sig_return_type, "" if doc else " ..."),
+            is_def=True,
+        )
 
         if doc:
-            self._print()
             self._print_doc(doc, indent + "    ")
             self._print("{}...".format(indent + "    "))
-        else:
-            self._print(" ...")
-
-        if not isinstance(fn, Method):
-            self._print()
 
     def print_property(self, cls: Class, prop: Property, indent: str):
         """
@@ -158,58 +292,66 @@ class Writer:
                 )
             )
 
+        typing = self._fix_typing(prop.type)
         self._print("{}@property".format(indent))
-        self._print(
-            "{}def {}(self) -> {}: ...".format(
-                indent, prop.name, self._fix_typing(prop.type.typing())
-            )
+        self._print_signature(
+            indent,
+            "def {}(".format(prop.name),
+            ["self"],
+            ") -> {}: ...".format(typing),
+            is_def=True,
         )
         if not prop.is_read_only():
             self._print("{}@{}.setter".format(indent, prop.name))
-            self._print(
-                "{}def {}(self, arg0: {}) -> None: ...".format(
-                    indent, prop.name, self._fix_typing(prop.type.typing())
-                )
+            self._print_signature(
+                indent,
+                "def {}(".format(prop.name),
+                ["self", "arg0: {}".format(typing)],
+                ") -> None: ...",
+                is_def=True,
             )
-        self._print()
 
     def print_class(self, cls: Class, indent: str = ""):
         """
         Print the given Class object at the given indentation level.
         """
 
-        bc = ""
-        if cls.bases or cls.is_abstract():
-            bases: list[str] = [
-                bc.canonical_name if bc.package.startswith("mobase") else bc.full_name
-                for bc in cls.bases
-            ]
-            if cls.is_abstract() and not any(bc.is_abstract() for bc in cls.bases):
-                bases.insert(0, "abc.ABC")
-            bc = "(" + ", ".join(bases) + ")"
+        bases: list[str] = [
+            bc.canonical_name if bc.package.startswith("mobase") else bc.full_name
+            for bc in cls.bases
+        ]
+        if cls.is_abstract() and not any(bc.is_abstract() for bc in cls.bases):
+            bases.insert(0, "abc.ABC")
+
+        empty = not (
+            cls.methods or cls.constants or cls.properties or cls.inner_classes
+        )
+        tail = ":" if cls.doc or not empty else ": ..."
 
         # Class declaration:
-        self._print("{}class {}{}:".format(indent, cls.name, bc), end="")
+        if bases:
+            self._print_signature(
+                indent, "class {}(".format(cls.name), bases, ")" + tail, is_def=False
+            )
+        else:
+            self._print("{}class {}{}".format(indent, cls.name, tail))
 
         if cls.doc:
-            self._print()
             self._print_doc(cls.doc, indent + "    ")
             self._print()
-
-        if not (cls.methods or cls.constants or cls.properties or cls.inner_classes):
-            if cls.doc:
+            if empty:
                 self._print("{}...".format(indent + "    "))
-            else:
-                self._print(" ...")
-            return
-
-        if not cls.doc:
-            self._print()
 
-        # Inner classes:
+        # Inner classes, followed by a blank line:
         for inner_class in cls.inner_classes:
             self.print_class(inner_class, indent=indent + "    ")
-            self._print()
+            if (
+                inner_class is not cls.inner_classes[-1]
+                or cls.constants
+                or cls.properties
+                or cls.methods
+            ):
+                self._print()
 
         # Constants:
         for constant in cls.constants:
@@ -219,7 +361,7 @@ class Writer:
 
             typing = ""
             if constant.type is not None:
-                typing = ": {}".format(self._fix_typing(constant.type.typing()))
+                typing = ": {}".format(self._fix_typing(constant.type))
 
             # Note: We do not print the value, we use ...
             self._print(
@@ -249,31 +391,28 @@ class Writer:
         for method in methods:
             self.print_function(method, indent=indent + "    ")
 
-        if cls.methods:
-            self._print()
-
-        if not cls.outer_class:
-            if isinstance(cls, Enum):
-                self._print()
-            self._print()
-
     def print_typing(self, typ: PyTyping):
-        self._print(f"{typ.name} = {typ.typing}")
+        self._print(f"{typ.name} = {normalize_strings(typ.typing)}")
 
     def print_constent(self, constant: Constant):
         assert constant.type is not None
         self._print(
-            "{}: {} = ...".format(
-                constant.name, self._fix_typing(constant.type.typing())
-            )
+            "{}: {} = ...".format(constant.name, self._fix_typing(constant.type))
         )
 
     def print_object(self, e: Class | Constant | list[Function] | PyTyping):
+        """
+        Print the given top-level object, without blank lines around it (see
+        mo2.stubs.generator.build.join_fragments()).
+        """
         if isinstance(e, Class):
             self.print_class(e)
 
         elif is_list_of(e, Function):
             for fn in e:
+                # functions with a body are followed by a blank line
+                if fn is not e[0] and not self._parts[-2].endswith(": ..."):
+                    self._print()
                 self.print_function(fn)
 
         elif isinstance(e, PyTyping):
@@ -0,0 +1,53 @@
+"""
+Check that the objects reused from the --cache-dir cache emit the same logs as when
+they are built.
+"""
+
+import logging
+import sys
+from pathlib import Path
+
+import pytest
+
+from mo2.stubs.generator.__main__ import main
+
+ROOT = Path(__file__).parent.parent
+SNAPSHOT = Path(__file__).parent.joinpath("data", "mobase-2.5.3.json.gz")
+CONFIG = ROOT.joinpath("configs", "config-2.5.yml")
+
+
+def _generate(
+    monkeypatch: pytest.MonkeyPatch,
+    caplog: pytest.LogCaptureFixture,
+    tmp_path: Path,
+) -> list[tuple[int, str]]:
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "mo2-stubs-generator",
+            "--snapshot",
+            SNAPSHOT.as_posix(),
+            "-c",
+            CONFIG.as_posix(),
+            "-o",
+            tmp_path.joinpath("mobase-stubs").as_posix(),
+            "--cache-dir",
+            tmp_path.joinpath("cache").as_posix(),
+            "--no-format",
+        ],
+    )
+
+    caplog.clear()
+    main()
+    return [(r.levelno, r.getMessage()) for r in caplog.records]
+
+
+def test_cache_logs(
+    monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture, tmp_path: Path
+) -> None:
+    cold = _generate(monkeypatch, caplog, tmp_path)
+    warm = _generate(monkeypatch, caplog, tmp_path)
+
+    assert any(level == logging.WARNING for level, _ in cold)
+    assert warm == cold
@@ -0,0 +1,56 @@
+"""
+Check that --check accepts the same --batch arguments as a build, without writing
+anything in the output folders.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+from mo2.stubs.generator.__main__ import main
+
+ROOT = Path(__file__).parent.parent
+SNAPSHOT = Path(__file__).parent.joinpath("data", "mobase-2.5.3.json.gz")
+CONFIG = ROOT.joinpath("configs", "config-2.5.yml")
+
+
+def test_check_batch(
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+    tmp_path: Path,
+) -> None:
+    # an existing folder as OUTPUT, which must not be read as a snapshot
+    first, second = tmp_path.joinpath("first"), tmp_path.joinpath("second")
+    first.mkdir()
+
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "mo2-stubs-generator",
+            "--snapshot",
+            SNAPSHOT.as_posix(),
+            "--check",
+            "--batch",
+            CONFIG.as_posix(),
+            first.as_posix(),
+            "--batch",
+            CONFIG.as_posix(),
+            second.as_posix(),
+            SNAPSHOT.as_posix(),
+        ],
+    )
+
+    # the exit status is 1 since the configuration of 2.5 is not complete for 2.5.3
+    with pytest.raises(SystemExit) as exit_info:
+        main()
+    assert exit_info.value.code == 1
+
+    output = capsys.readouterr().out
+    assert "Checked 2 versions of the stubs" in output
+    assert f"  {first.as_posix()} in " in output
+    assert f"  {second.as_posix()} in " in output
+
+    assert not any(first.iterdir())
+    assert not second.exists()
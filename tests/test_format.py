@@ -0,0 +1,74 @@
+"""
+Check that the stubs written by the generator with --no-format are the stubs ruff
+would produce, i.e., that running ruff on them changes nothing.
+
+tests/data/mobase-2.5.3.json.gz is a snapshot (see --capture) of the objects of the
+MO2 2.5.3 stubs under stubs/2.5.3/mobase-stubs, since mobase can only be loaded on
+Windows with a MO2 installation.
+"""
+
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+from mo2.stubs.generator.__main__ import format_stubs, main
+from mo2.stubs.generator.snapshot import ModuleInfo, load_snapshot, save_snapshot
+
+ROOT = Path(__file__).parent.parent
+SNAPSHOT = Path(__file__).parent.joinpath("data", "mobase-2.5.3.json.gz")
+CONFIG = ROOT.joinpath("configs", "config-2.5.yml")
+
+
+def _generate(monkeypatch: pytest.MonkeyPatch, snapshot: Path, output: Path) -> None:
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "mo2-stubs-generator",
+            "--snapshot",
+            snapshot.as_posix(),
+            "-c",
+            CONFIG.as_posix(),
+            "-o",
+            output.as_posix(),
+            "--no-format",
+        ],
+    )
+    main()
+
+
+def _empty_widgets(path: Path) -> Path:
+    # mobase.widgets without objects, the module only contains its imports
+    modules = load_snapshot(SNAPSHOT)
+    modules["mobase.widgets"] = ModuleInfo("mobase.widgets", ())
+    save_snapshot(path, modules.values())
+    return path
+
+
+@pytest.mark.skipif(shutil.which("ruff") is None, reason="ruff is not installed")
+@pytest.mark.parametrize("empty_widgets", [False, True], ids=["2.5.3", "empty"])
+def test_no_format_matches_ruff(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, empty_widgets: bool
+) -> None:
+    snapshot = SNAPSHOT
+    if empty_widgets:
+        snapshot = _empty_widgets(tmp_path.joinpath("snapshot.json"))
+
+    output = tmp_path.joinpath("mobase-stubs")
+    _generate(monkeypatch, snapshot, output)
+
+    formatted = tmp_path.joinpath("formatted")
+    shutil.copytree(output, formatted)
+    format_stubs(sorted(formatted.rglob("*.pyi")))
+
+    paths = sorted(output.rglob("*.pyi"))
+    assert [p.relative_to(output) for p in paths] == [
+        p.relative_to(formatted) for p in sorted(formatted.rglob("*.pyi"))
+    ]
+    for path in paths:
+        assert (
+            path.read_bytes()
+            == formatted.joinpath(path.relative_to(output)).read_bytes()
+        ), path.relative_to(output).as_posix()